@@ -7,10 +7,15 @@ Supports direct messages, mentions, and proactive messaging.
 
 from __future__ import annotations
 import os
+import re
 import asyncio
 import logging
+import stat
 import time
-from typing import Dict, List, Optional
+import weakref
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 
 try:
     import discord
@@ -19,6 +24,12 @@ try:
 except ImportError:
     HAS_DISCORD = False
 
+try:
+    import re2  # google-re2: linear-time automaton, no backtracking
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
 from python.helpers.plugin_api import ChannelAdapter, ChannelMessage
 from python.helpers.lifecycle_reactions import (
     LifecycleTracker, SubAgentManager, check_dm_access, get_model_override,
@@ -29,6 +40,112 @@ from .streaming import DiscordStreamingReply
 
 logger = logging.getLogger("agent-zero.plugins.discord")
 
+# Replies faster than this never trigger the typing indicator
+TYPING_DELAY_SECONDS = 0.8
+
+# Discord upload limit for a single attachment
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
+
+# Downloaded attachments larger than this spill from memory to a temp file
+ATTACHMENT_SPOOL_BYTES = 1024 * 1024
+
+# Max simultaneous connections for attachment downloads (shared session)
+ATTACHMENT_DOWNLOAD_CONNECTIONS = 8
+
+# File extensions we should auto-attach
+ATTACHABLE_EXTENSIONS = frozenset({
+    # Images
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.svg',
+    # Documents
+    '.pdf', '.txt', '.csv', '.json', '.xml', '.html',
+    # Audio/Video
+    '.mp3', '.wav', '.mp4', '.webm', '.ogg',
+    # Archives
+    '.zip', '.tar', '.gz',
+    # Code outputs
+    '.py', '.js', '.ts', '.md',
+})
+
+# Patterns to find file paths in text
+# Match: /absolute/path/to/file.ext or `backtick-wrapped paths`
+_PATH_PATTERNS = (
+    r'`(/[^\s`]+\.[a-zA-Z0-9]{2,5})`',           # `backtick-quoted` paths
+    r'(?:^|[\s:])(/[^\s\'"`,\)]+\.[a-zA-Z0-9]{2,5})',  # bare absolute paths
+    r'\*\*Saved to:\*\*\s*`?(/[^\s`]+)`?',        # **Saved to:** /path
+    r'saved (?:to|at|in)[:\s]+`?(/[^\s`]+)`?',    # saved to: /path
+    r'output[:\s]+`?(/[^\s`]+\.[a-zA-Z0-9]{2,5})`?',  # output: /path
+    r'generated[:\s]+`?(/[^\s`]+\.[a-zA-Z0-9]{2,5})`?',  # generated: /path
+)
+
+
+def _compile_path_re(pattern: str):
+    """Compile one path pattern, using RE2 when installed and falling back to stdlib re."""
+    pattern = "(?im)" + pattern
+    if HAS_RE2:
+        try:
+            return re2.compile(pattern)
+        except Exception as e:
+            logger.debug(f"RE2 rejected path pattern, using re: {e}")
+    return re.compile(pattern)
+
+
+# Each pattern gets its own pass: a single alternation would only report the
+# leftmost alternative at a position (e.g. "saved to /a.png." but not "/a.png")
+_PATH_RES = tuple(_compile_path_re(p) for p in _PATH_PATTERNS)
+
+# How long a cached stat() result for an auto-detected path stays valid
+_STAT_TTL_SECONDS = 5
+
+
+@lru_cache(maxsize=1024)
+def _stat_cached(path: str, bucket: int) -> Tuple[bool, int]:
+    """
+    Return (is_regular_file, size) for a path with a single stat() call.
+    `bucket` is a coarse time slot, so entries go stale after _STAT_TTL_SECONDS.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False, 0
+    return stat.S_ISREG(st.st_mode), st.st_size
+
+# Inbound text attachments are inlined up to this many characters.
+# UTF-8 uses at most 4 bytes per character, so decoding the first
+# _MAX_INLINE_BYTES always yields enough text to fill the limit.
+_MAX_INLINE_CHARS = 50000
+_MAX_INLINE_BYTES = _MAX_INLINE_CHARS * 4
+
+
+# Inbound attachment extensions treated as text even without a text/* content type
+_TEXT_EXTENSIONS = frozenset({
+    ".txt", ".md", ".csv", ".json", ".xml", ".yaml", ".yml",
+    ".py", ".js", ".ts", ".html", ".css", ".sh", ".bat",
+    ".log", ".cfg", ".ini", ".toml", ".env", ".sql",
+})
+
+
+def _is_text_attachment(att) -> bool:
+    """Whether an inbound attachment should be downloaded and inlined as text."""
+    if att.content_type and att.content_type.startswith("text/"):
+        return True
+    # rpartition (not splitext) so dotfiles like ".env" keep their extension
+    ext = att.filename.rpartition(".")[2].lower()
+    return ("." + ext) in _TEXT_EXTENSIONS
+
+
+# Upper bound on cached DM/channel handles before the oldest is evicted
+_TARGET_CACHE_SIZE = 256
+
+# Env vars read on every /a0 status or model call; only these are memoized
+_CACHED_ENV_KEYS = frozenset({"CHAT_MODEL", "MODEL_CHAT", "UTILITY_MODEL", "MODEL_UTILITY"})
+
+
+def _cache_put(cache: dict, key, value) -> None:
+    """Insert into a size-bounded dict, evicting the oldest entry when full."""
+    if key not in cache and len(cache) >= _TARGET_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
 
 # --- Discord Components v2: Confirmation View ---
 class ConfirmationView(discord.ui.View if HAS_DISCORD else object):
@@ -38,27 +155,25 @@ class ConfirmationView(discord.ui.View if HAS_DISCORD else object):
         if HAS_DISCORD:
             super().__init__(timeout=timeout)
         self.result: Optional[bool] = None
-        self._event = asyncio.Event()
 
     if HAS_DISCORD:
         @discord.ui.button(label="Approve", style=discord.ButtonStyle.success, emoji="✅")
         async def approve_button(self, interaction: discord.Interaction, button: discord.ui.Button):
             self.result = True
-            self._event.set()
+            self.stop()
             await interaction.response.edit_message(content="✅ **Approved**", view=None)
 
         @discord.ui.button(label="Deny", style=discord.ButtonStyle.danger, emoji="❌")
         async def deny_button(self, interaction: discord.Interaction, button: discord.ui.Button):
             self.result = False
-            self._event.set()
+            self.stop()
             await interaction.response.edit_message(content="❌ **Denied**", view=None)
 
     async def wait_for_result(self) -> Optional[bool]:
         """Wait for user to click a button. Returns True/False/None (timeout)."""
-        try:
-            await asyncio.wait_for(self._event.wait(), timeout=120.0)
-        except asyncio.TimeoutError:
-            pass
+        if HAS_DISCORD:
+            # Resolves on stop() from a button, or when the view's own timeout fires
+            await self.wait()
         return self.result
 
 class DiscordChannelAdapter(ChannelAdapter):
@@ -84,19 +199,31 @@ class DiscordChannelAdapter(ChannelAdapter):
         self.respond_to_mentions = respond_to_mentions
         self._client: Optional[discord.Client] = None
         self._ready_event = asyncio.Event()
+        self._http_session = None  # Shared aiohttp session for attachment downloads
+        self._guild_count: int = 0  # Maintained from on_ready / guild join+remove events
+        # Built in on_ready once our user ID is known
+        self._mention_tokens: Tuple[str, ...] = ()  # ("<@id>", "<@!id>")
+        self._mention_re: Optional[re.Pattern] = None
+        # Resolved send targets, so repeat sends skip the REST fetch
+        self._dm_channel_cache: Dict[int, "discord.DMChannel"] = {}  # user_id -> DM channel
+        self._channel_cache: Dict[int, "discord.abc.Messageable"] = {}  # channel_id -> fetched channel
+        # target_id -> ordered-send lock; entries vanish once no send holds or awaits them
+        self._send_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
 
         # --- Slash command & feature state ---
-        self._session_reset_channels: set = set()
-        self._abort_channels: set = set()
+        self._session_reset_channels: Set[int] = set()  # Raw channel IDs
+        self._abort_channels: Set[int] = set()  # Raw channel IDs
         self._verbose_mode: str = "off"
+        self._env_cache: Dict[str, str] = {}  # _CACHED_ENV_KEYS var -> value, set ones only
         self._streaming_mode: str = "off"  # off, partial, block
-        self._usage_stats: Dict[str, int] = {
-            "prompt_tokens": 0,
-            "completion_tokens": 0,
-            "total_tokens": 0,
-            "message_count": 0,
-        }
-        self._thread_bindings: Dict[str, dict] = {}  # Legacy compat
+        self._usage_stats: Counter = Counter(
+            prompt_tokens=0,
+            completion_tokens=0,
+            total_tokens=0,
+            message_count=0,
+        )
         self._thread_manager = ThreadBindingManager(ttl_hours=24.0)
         self._subagent_manager = SubAgentManager()
         self._pairing_manager = PairingManager(
@@ -104,6 +231,10 @@ class DiscordChannelAdapter(ChannelAdapter):
             owner_user_id=owner_user_id,
         )
         self._project_manager = None  # Initialized on start() after imports
+        # Raw channel IDs bound to projects. None until seeded from the
+        # project manager; while None, every guild message goes through
+        # check_access() as before
+        self._project_channel_ids: Optional[Set[int]] = None
     
     async def start(self):
         """Start the Discord bot."""
@@ -116,6 +247,9 @@ class DiscordChannelAdapter(ChannelAdapter):
             logger.error(f"Discord bot token not found in env var: {self.bot_token_env}")
             return
         
+        # Restore approved/blocked DM users before any message can arrive
+        await self._pairing_manager.load()
+        
         # Set up intents
         intents = Intents.default()
         intents.message_content = True
@@ -126,6 +260,8 @@ class DiscordChannelAdapter(ChannelAdapter):
         self._client = discord.Client(intents=intents)
         
         # --- Set up slash commands ---
+        # CommandTree registers itself with the client's connection state,
+        # so discord.py dispatches application commands to it natively.
         tree = app_commands.CommandTree(self._client)
         self._command_tree = tree
         try:
@@ -138,6 +274,12 @@ class DiscordChannelAdapter(ChannelAdapter):
         try:
             from .projects import ProjectManager
             self._project_manager = ProjectManager(adapter=self)
+            # Seed the channel set if the manager can enumerate its project
+            # channels; it keeps it current through register_project_channel()
+            # and unregister_project_channel() from its bind/unbind path
+            channel_ids = getattr(self._project_manager, "channel_ids", None)
+            if callable(channel_ids):
+                self._project_channel_ids = {int(c) for c in channel_ids()}
             logger.info("Project system initialized")
         except Exception as e:
             logger.error(f"Failed to initialize project system: {e}")
@@ -146,6 +288,12 @@ class DiscordChannelAdapter(ChannelAdapter):
         @self._client.event
         async def on_ready():
             logger.info(f"Discord bot connected as: {self._client.user}")
+            # Both <@id> and legacy nickname <@!id> mentions of the bot
+            uid = self._client.user.id
+            self._mention_tokens = (f"<@{uid}>", f"<@!{uid}>")
+            self._mention_re = re.compile("|".join(map(re.escape, self._mention_tokens)))
+            # Seed the guild counter; join/remove events keep it current
+            self._guild_count = len(self._client.guilds)
             # Sync slash commands with Discord
             try:
                 synced = await tree.sync()
@@ -169,38 +317,39 @@ class DiscordChannelAdapter(ChannelAdapter):
             self._ready_event.set()
         
         @self._client.event
-        async def on_interaction(interaction: discord.Interaction):
-            """Route slash command interactions to the CommandTree."""
-            if interaction.type == discord.InteractionType.application_command:
-                await tree._call(interaction)
-            elif interaction.type == discord.InteractionType.autocomplete:
-                await tree._call(interaction)
+        async def on_guild_join(guild: discord.Guild):
+            self._guild_count += 1
+        
+        @self._client.event
+        async def on_guild_remove(guild: discord.Guild):
+            self._guild_count = max(0, self._guild_count - 1)
         
         @self._client.event
         async def on_message(message: discord.Message):
             # Don't respond to ourselves
-            if message.author == self._client.user:
+            bot_user = self._client.user
+            if message.author == bot_user:
                 return
             
-            # --- Check for thread binding ---
-            thread_id = str(message.channel.id)
-            thread_binding = self._thread_manager.get_binding(thread_id)
-            
-            # --- Check session resets ---
-            channel_key = str(message.channel.id)
-            if channel_key in self._session_reset_channels:
-                self._session_reset_channels.discard(channel_key)
-                # Context reset flag in metadata
+            channel_id = message.channel.id
+            channel_key = str(channel_id)
+            is_dm = isinstance(message.channel, discord.DMChannel)
+            is_thread = isinstance(message.channel, discord.Thread)
+            content = message.content
             
             # Check if we should respond
             should_respond = False
-            content = message.content
             project_context = None  # Set if message is in a project channel
             
-            # Project channel check — always respond, with access control
-            if self._project_manager and not isinstance(message.channel, discord.DMChannel):
+            # Project channel check — always respond, with access control.
+            # Runs before the thread binding is touched, so a denied message
+            # doesn't refresh the binding's activity
+            project_ids = self._project_channel_ids
+            if self._project_manager is not None and (
+                channel_id in project_ids if project_ids is not None else not is_dm
+            ):
                 has_access, project = self._project_manager.check_access(
-                    str(message.channel.id), str(message.author.id)
+                    channel_key, str(message.author.id)
                 )
                 if project is not None:
                     if not has_access:
@@ -210,21 +359,36 @@ class DiscordChannelAdapter(ChannelAdapter):
                         )
                         return
                     should_respond = True
-                    project_context = {
-                        "project_id": project.id,
-                        "project_name": project.name,
-                        "project_owner": project.user_id,
-                        "project_slug": project.slug,
-                    }
-                    self._project_manager.touch(str(message.channel.id))
+                    project_context = self._project_context(project)
+                    self._project_manager.touch(channel_key)
+            
+            # --- Check for thread binding (keyed on the raw int channel ID) ---
+            # A bound thread always responds, so record its activity in the
+            # same lookup
+            thread_binding = self._thread_manager.get_and_touch(channel_id)
+            
+            # Fast path: bail out before any per-message work unless one of
+            # the response triggers below could possibly apply
+            if not (
+                should_respond
+                or thread_binding
+                or (is_dm and self.respond_to_dms)
+                or (is_thread and message.channel.owner_id == bot_user.id)
+                or bot_user in message.mentions
+                or content.startswith(self.command_prefix)
+            ):
+                return
+            
+            # --- Check session resets ---
+            session_reset = channel_id in self._session_reset_channels
+            if session_reset:
+                self._session_reset_channels.discard(channel_id)
             
             # Thread-bound messages always respond
             if thread_binding:
                 should_respond = True
-                # Update activity tracking
-                self._thread_manager.touch(thread_id)
             # DM check
-            elif isinstance(message.channel, discord.DMChannel):
+            elif is_dm:
                 if self.respond_to_dms:
                     # Use PairingManager for DM access control
                     pm = self._pairing_manager
@@ -237,7 +401,7 @@ class DiscordChannelAdapter(ChannelAdapter):
                         request = pm.create_request(
                             sender_id=user_id,
                             sender_name=message.author.display_name,
-                            channel_id=str(message.channel.id),
+                            channel_id=channel_key,
                         )
                         if request:
                             await message.channel.send(
@@ -262,16 +426,17 @@ class DiscordChannelAdapter(ChannelAdapter):
                         should_respond = True
             
             # Mention check
-            elif self._client.user in message.mentions:
+            elif bot_user in message.mentions:
                 if self.respond_to_mentions:
-                    # Remove the mention from the message
-                    content = content.replace(f"<@{self._client.user.id}>", "").strip()
-                    content = content.replace(f"<@!{self._client.user.id}>", "").strip()
+                    # Remove the mention from the message (reply pings carry no token)
+                    if any(token in content for token in self._mention_tokens):
+                        content = self._mention_re.sub("", content)
+                    content = content.strip()
                     should_respond = True
             
             # Thread messages (non-bound) — respond if in a thread we created
-            elif isinstance(message.channel, discord.Thread):
-                if message.channel.owner_id == self._client.user.id:
+            elif is_thread:
+                if message.channel.owner_id == bot_user.id:
                     should_respond = True
             
             # Command prefix check
@@ -283,39 +448,37 @@ class DiscordChannelAdapter(ChannelAdapter):
                 return
             
             # Track usage
-            self._usage_stats["message_count"] += 1
+            self.record_usage(message_count=1)
             
             # Build attachments list — download text files inline, keep image URLs for VLM
+            # Text-based files are read concurrently and injected inline so the LLM can read them
+            text_atts = [att for att in message.attachments if _is_text_attachment(att)]
+            downloads = dict(zip(
+                (att.id for att in text_atts),
+                await asyncio.gather(
+                    *(att.read() for att in text_atts), return_exceptions=True
+                ),
+            ))
             attachments = []
             for att in message.attachments:
-                # Text-based files: download content and inject inline so the LLM can read them
-                is_text = (
-                    (att.content_type and att.content_type.startswith("text/"))
-                    or att.filename.lower().endswith((
-                        ".txt", ".md", ".csv", ".json", ".xml", ".yaml", ".yml",
-                        ".py", ".js", ".ts", ".html", ".css", ".sh", ".bat",
-                        ".log", ".cfg", ".ini", ".toml", ".env", ".sql",
-                    ))
-                )
-                if is_text:
-                    try:
-                        file_bytes = await att.read()
-                        text_content = file_bytes.decode("utf-8", errors="replace")
-                        # Truncate very large files to avoid context overflow
-                        if len(text_content) > 50000:
-                            text_content = text_content[:50000] + "\n... [truncated, file too large]"
-                        content += (
-                            f"\n\n--- Attached file: {att.filename} ---\n"
-                            f"{text_content}\n"
-                            f"--- End of {att.filename} ---"
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to read text attachment {att.filename}: {e}")
-                        attachments.append(att.url)
-                else:
+                file_bytes = downloads.get(att.id)
+                if file_bytes is None:
                     # Images, PDFs, etc. — pass URL for VLM processing
                     attachments.append(att.url)
-            
+                elif isinstance(file_bytes, Exception):
+                    logger.warning(f"Failed to read text attachment {att.filename}: {file_bytes}")
+                    attachments.append(att.url)
+                else:
+                    # Decode only the prefix that can fit, instead of the whole blob
+                    text_content = file_bytes[:_MAX_INLINE_BYTES].decode("utf-8", errors="replace")
+                    # Truncate very large files to avoid context overflow
+                    if len(text_content) > _MAX_INLINE_CHARS:
+                        text_content = text_content[:_MAX_INLINE_CHARS] + "\n... [truncated, file too large]"
+                    content += (
+                        f"\n\n--- Attached file: {att.filename} ---\n"
+                        f"{text_content}\n"
+                        f"--- End of {att.filename} ---"
+                    )
             
             # --- Lifecycle reactions ---
             async def _react(msg_ref, emoji):
@@ -340,7 +503,6 @@ class DiscordChannelAdapter(ChannelAdapter):
             # Create ChannelMessage with lifecycle tracker
             # Build the reply target so initialize.py knows where to send the response.
             # For DMs, reply back via DM (user:<id>). For channels, reply to the channel.
-            is_dm = isinstance(message.channel, discord.DMChannel)
             if is_dm:
                 reply_target = f"user:{message.author.id}"
             else:
@@ -354,12 +516,12 @@ class DiscordChannelAdapter(ChannelAdapter):
                 attachments=attachments,
                 metadata={
                     "guild_id": str(message.guild.id) if message.guild else None,
-                    "channel_id": str(message.channel.id),
+                    "channel_id": channel_key,
                     "message_id": str(message.id),
                     "is_dm": is_dm,
-                    "is_thread": isinstance(message.channel, discord.Thread),
+                    "is_thread": is_thread,
                     "thread_binding": thread_binding,  # None or {target, user_id, bound_at}
-                    "session_reset": channel_key in self._session_reset_channels,
+                    "session_reset": session_reset,
                     "lifecycle_tracker": tracker,
                     "model_override": get_model_override("discord"),
                     "discord_message": message,  # For Components v2
@@ -373,9 +535,8 @@ class DiscordChannelAdapter(ChannelAdapter):
             await tracker.phase("queued")
 
             try:
-                async with message.channel.typing():
-                    await tracker.phase("thinking")
-                    await self._dispatch_message(channel_msg)
+                await tracker.phase("thinking")
+                await self._dispatch_with_typing(message.channel, channel_msg)
                 await tracker.done()
             except Exception as e:
                 await tracker.error()
@@ -390,10 +551,92 @@ class DiscordChannelAdapter(ChannelAdapter):
         except Exception as e:
             logger.error(f"Discord bot error: {e}")
     
+    async def _dispatch_with_typing(self, channel, channel_msg: ChannelMessage):
+        """
+        Dispatch a message, showing the typing indicator only if handling
+        outlasts TYPING_DELAY_SECONDS — fast replies skip the typing POST.
+        """
+        task = asyncio.ensure_future(self._dispatch_message(channel_msg))
+        try:
+            done, _ = await asyncio.wait({task}, timeout=TYPING_DELAY_SECONDS)
+            if not done:
+                async with channel.typing():
+                    await task
+            else:
+                task.result()  # Re-raise any dispatch error
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+    @property
+    def guild_count(self) -> int:
+        """Number of guilds the bot is in, without copying the client's guild cache."""
+        return self._guild_count
+
+    def get_env(self, *keys: str, default: str = "") -> str:
+        """
+        Return the first of `keys` that is set in the environment.
+        Set values of _CACHED_ENV_KEYS are memoized; change those through
+        set_env() so the cache stays in sync. Other keys and misses are
+        always read fresh.
+        """
+        cache = self._env_cache
+        for key in keys:
+            value = cache.get(key)
+            if value is None:
+                value = os.environ.get(key)
+                if value is None:
+                    continue
+                if key in _CACHED_ENV_KEYS:
+                    cache[key] = value
+            return value
+        return default
+
+    def set_env(self, key: str, value: str) -> None:
+        """Set an environment variable (runtime override) and update the cache."""
+        os.environ[key] = value
+        if key in _CACHED_ENV_KEYS:
+            self._env_cache[key] = value
+
+    def record_usage(self, **counts: int) -> None:
+        """Add to the usage counters in one Counter update, e.g. record_usage(prompt_tokens=120, total_tokens=180)."""
+        self._usage_stats.update(counts)
+
+    @staticmethod
+    def _project_context(project) -> dict:
+        """
+        Message metadata for a project, built once and memoized on the
+        long-lived Project object. Clear `project._context_dict` on rename.
+        """
+        context = getattr(project, "_context_dict", None)
+        if context is None:
+            context = project._context_dict = {
+                "project_id": project.id,
+                "project_name": project.name,
+                "project_owner": project.user_id,
+                "project_slug": project.slug,
+            }
+        return context
+
+    def register_project_channel(self, channel_id) -> None:
+        """Called by the project manager when a channel is bound to a project."""
+        if self._project_channel_ids is not None:
+            self._project_channel_ids.add(int(channel_id))
+
+    def unregister_project_channel(self, channel_id) -> None:
+        """Called by the project manager when a project channel is removed."""
+        if self._project_channel_ids is not None:
+            self._project_channel_ids.discard(int(channel_id))
+
     async def stop(self):
         """Stop the Discord bot gracefully."""
         # Stop thread binding cleanup
         await self._thread_manager.stop_cleanup_loop()
+        # Don't lose allowlist changes still waiting on the debounced save
+        await self._pairing_manager.flush()
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
         if self._client and not self._client.is_closed():
             await self._client.close()
             logger.info("Discord bot disconnected")
@@ -463,17 +706,12 @@ class DiscordChannelAdapter(ChannelAdapter):
             chunks = self._split_message(content, max_length=2000)
             
             if target_type == "user":
-                user = await self._client.fetch_user(target_id)
-                dm_channel = await user.create_dm()
-                for i, chunk in enumerate(chunks):
-                    # Attach files only on the first chunk
-                    files = discord_files if i == 0 else []
-                    await dm_channel.send(chunk, files=files)
+                dm_channel = await self._get_dm_channel(target_id)
+                async with self._target_lock(target_id):
+                    await self._send_chunks(dm_channel, chunks, discord_files)
                     
             elif target_type == "channel":
-                channel = self._client.get_channel(target_id)
-                if channel is None:
-                    channel = await self._client.fetch_channel(target_id)
+                channel = await self._get_channel(target_id)
                 
                 # Forum channel: auto-create thread
                 if isinstance(channel, discord.ForumChannel):
@@ -489,9 +727,8 @@ class DiscordChannelAdapter(ChannelAdapter):
                         for sub_chunk in self._split_message(remaining):
                             await thread.thread.send(sub_chunk)
                 else:
-                    for i, chunk in enumerate(chunks):
-                        files = discord_files if i == 0 else []
-                        await channel.send(chunk, files=files)
+                    async with self._target_lock(target_id):
+                        await self._send_chunks(channel, chunks, discord_files)
                     
             else:
                 logger.error(f"Unknown target type: {target_type}")
@@ -503,56 +740,133 @@ class DiscordChannelAdapter(ChannelAdapter):
             logger.error(f"Bot lacks permission to send to {to}")
             return False
         except discord.NotFound:
+            # Drop any cached handle so the next send re-resolves the target
+            self._dm_channel_cache.pop(target_id, None)
+            self._channel_cache.pop(target_id, None)
             logger.error(f"Discord target not found: {to}")
             return False
         except Exception as e:
             logger.error(f"Failed to send Discord message: {e}")
             return False
     
+    def _target_lock(self, target_id: int) -> asyncio.Lock:
+        """
+        Per-target send lock. Chunks of one reply must arrive in order, so
+        they are sent sequentially; the lock keeps concurrent replies to
+        the same target from interleaving their chunks.
+        """
+        lock = self._send_locks.get(target_id)
+        if lock is None:
+            # Held strongly only by `async with` users, so idle targets drop out
+            lock = self._send_locks[target_id] = asyncio.Lock()
+        return lock
+    
+    @staticmethod
+    async def _send_chunks(channel, chunks: List[str], files: list):
+        """Send message chunks in order, attaching files only to the first."""
+        for i, chunk in enumerate(chunks):
+            await channel.send(chunk, files=files if i == 0 else [])
+    
+    async def _get_dm_channel(self, user_id: int):
+        """Resolve (and cache) the DM channel for a user."""
+        dm_channel = self._dm_channel_cache.get(user_id)
+        if dm_channel is None:
+            user = self._client.get_user(user_id) or await self._client.fetch_user(user_id)
+            dm_channel = user.dm_channel or await user.create_dm()
+            _cache_put(self._dm_channel_cache, user_id, dm_channel)
+        return dm_channel
+    
+    async def _get_channel(self, channel_id: int):
+        """Resolve a channel from the gateway cache, falling back to a cached REST fetch."""
+        channel = self._client.get_channel(channel_id)
+        if channel is None:
+            channel = self._channel_cache.get(channel_id)
+        if channel is None:
+            channel = await self._client.fetch_channel(channel_id)
+            _cache_put(self._channel_cache, channel_id, channel)
+        return channel
+    
     async def _prepare_attachments(self, attachments: List[str]) -> list:
         """
         Convert attachment paths/URLs to discord.File objects.
         
         Handles:
           - Local file paths → read from disk
-          - HTTP(S) URLs → download via aiohttp
+          - HTTP(S) URLs → download via aiohttp into a spooled temp file
           - Skips files >25MB (Discord limit)
+        
+        URLs are downloaded concurrently; the result keeps the input order.
         """
-        import os
-        import io
+        if not attachments:
+            return []
+        results = await asyncio.gather(
+            *(self._prepare_attachment(att) for att in attachments)
+        )
+        return [f for f in results if f is not None]
+    
+    async def _prepare_attachment(self, att: str):
+        """Build one discord.File for _prepare_attachments, or None if skipped."""
+        import tempfile
         
-        files = []
-        for att in attachments:
-            try:
-                if att.startswith(("http://", "https://")):
-                    # Download from URL
-                    import aiohttp
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(att, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                            if resp.status != 200:
-                                logger.warning(f"Failed to download attachment {att}: HTTP {resp.status}")
-                                continue
-                            data = await resp.read()
-                            if len(data) > 25 * 1024 * 1024:  # 25MB Discord limit
-                                logger.warning(f"Attachment too large (>25MB): {att}")
-                                continue
-                            # Extract filename from URL
-                            filename = att.split("/")[-1].split("?")[0] or "attachment"
-                            files.append(discord.File(io.BytesIO(data), filename=filename))
-                else:
-                    # Local file path
-                    if not os.path.exists(att):
-                        logger.warning(f"Attachment file not found: {att}")
-                        continue
-                    file_size = os.path.getsize(att)
-                    if file_size > 25 * 1024 * 1024:
+        try:
+            if att.startswith(("http://", "https://")):
+                # Download from URL
+                session = await self._get_http_session()
+                async with session.get(att) as resp:
+                    if resp.status != 200:
+                        logger.warning(f"Failed to download attachment {att}: HTTP {resp.status}")
+                        return None
+                    # Reject early on the advertised size, then stream with a hard cap
+                    if (resp.content_length or 0) > MAX_ATTACHMENT_BYTES:
                         logger.warning(f"Attachment too large (>25MB): {att}")
-                        continue
-                    filename = os.path.basename(att)
-                    files.append(discord.File(att, filename=filename))
-            except Exception as e:
-                logger.warning(f"Failed to prepare attachment {att}: {e}")
-        return files
+                        return None
+                    buf = tempfile.SpooledTemporaryFile(max_size=ATTACHMENT_SPOOL_BYTES)
+                    try:
+                        async for block in resp.content.iter_chunked(64 * 1024):
+                            buf.write(block)
+                            if buf.tell() > MAX_ATTACHMENT_BYTES:
+                                break
+                    except BaseException:
+                        buf.close()
+                        raise
+                    if buf.tell() > MAX_ATTACHMENT_BYTES:
+                        buf.close()
+                        logger.warning(f"Attachment too large (>25MB): {att}")
+                        return None
+                    buf.seek(0)
+                    # Extract filename from URL
+                    filename = att.split("/")[-1].split("?")[0] or "attachment"
+                    return discord.File(buf, filename=filename)
+            # Local file path
+            if not os.path.exists(att):
+                logger.warning(f"Attachment file not found: {att}")
+                return None
+            file_size = os.path.getsize(att)
+            if file_size > MAX_ATTACHMENT_BYTES:
+                logger.warning(f"Attachment too large (>25MB): {att}")
+                return None
+            filename = os.path.basename(att)
+            return discord.File(att, filename=filename)
+        except Exception as e:
+            logger.warning(f"Failed to prepare attachment {att}: {e}")
+            return None
+    
+    async def _get_http_session(self):
+        """
+        Return the shared aiohttp session, creating it on first use.
+        Reusing one session keeps connections pooled across downloads.
+        """
+        if self._http_session is None or self._http_session.closed:
+            import aiohttp
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=ATTACHMENT_DOWNLOAD_CONNECTIONS,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30,
+                ),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+        return self._http_session
     
     def _extract_file_paths(self, content: str) -> List[str]:
         """
@@ -563,45 +877,21 @@ class DiscordChannelAdapter(ChannelAdapter):
         (e.g. an image) and reports the path in its response text,
         but nobody explicitly passes it as an attachment.
         """
-        import re
-        import os
-        
-        # File extensions we should auto-attach
-        ATTACHABLE_EXTENSIONS = {
-            # Images
-            '.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.svg',
-            # Documents
-            '.pdf', '.txt', '.csv', '.json', '.xml', '.html',
-            # Audio/Video
-            '.mp3', '.wav', '.mp4', '.webm', '.ogg',
-            # Archives
-            '.zip', '.tar', '.gz',
-            # Code outputs
-            '.py', '.js', '.ts', '.md',
-        }
-        
-        # Patterns to find file paths in text
-        # Match: /absolute/path/to/file.ext or `backtick-wrapped paths`
-        path_patterns = [
-            r'`(/[^\s`]+\.[a-zA-Z0-9]{2,5})`',           # `backtick-quoted` paths
-            r'(?:^|[\s:])(/[^\s\'"`,\)]+\.[a-zA-Z0-9]{2,5})',  # bare absolute paths
-            r'\*\*Saved to:\*\*\s*`?(/[^\s`]+)`?',        # **Saved to:** /path
-            r'saved (?:to|at|in)[:\s]+`?(/[^\s`]+)`?',    # saved to: /path
-            r'output[:\s]+`?(/[^\s`]+\.[a-zA-Z0-9]{2,5})`?',  # output: /path
-            r'generated[:\s]+`?(/[^\s`]+\.[a-zA-Z0-9]{2,5})`?',  # generated: /path
-        ]
-        
         found_paths = set()
-        for pattern in path_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE):
+        bucket = int(time.monotonic() // _STAT_TTL_SECONDS)
+        for path_re in _PATH_RES:
+            for match in path_re.finditer(content):
                 path = match.group(1)
+                if path in found_paths:
+                    continue
                 # Verify: must exist, have attachable extension, be under 25MB
                 ext = os.path.splitext(path)[1].lower()
-                if ext in ATTACHABLE_EXTENSIONS and os.path.isfile(path):
-                    file_size = os.path.getsize(path)
-                    if file_size <= 25 * 1024 * 1024:
-                        found_paths.add(path)
-                        logger.info(f"Auto-detected attachable file: {path}")
+                if ext not in ATTACHABLE_EXTENSIONS:
+                    continue
+                is_file, file_size = _stat_cached(path, bucket)
+                if is_file and file_size <= MAX_ATTACHMENT_BYTES:
+                    found_paths.add(path)
+                    logger.info(f"Auto-detected attachable file: {path}")
         
         return list(found_paths)
     
@@ -638,21 +928,27 @@ class DiscordChannelAdapter(ChannelAdapter):
         if len(content) <= max_length:
             return [content]
         
+        # Walk a cursor over the string instead of re-slicing the remainder
         chunks = []
-        while content:
-            if len(content) <= max_length:
-                chunks.append(content)
+        pos, n = 0, len(content)
+        while pos < n:
+            end = pos + max_length
+            if end >= n:
+                chunks.append(content[pos:])
                 break
             
             # Try to split at a newline
-            split_at = content.rfind("\n", 0, max_length)
+            split_at = content.rfind("\n", pos, end)
             if split_at == -1:
                 # Try space
-                split_at = content.rfind(" ", 0, max_length)
+                split_at = content.rfind(" ", pos, end)
             if split_at == -1:
-                split_at = max_length
+                split_at = end
             
-            chunks.append(content[:split_at])
-            content = content[split_at:].lstrip()
+            chunks.append(content[pos:split_at])
+            # Skip leading whitespace of the next chunk
+            pos = split_at
+            while pos < n and content[pos].isspace():
+                pos += 1
         
         return chunks
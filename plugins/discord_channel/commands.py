@@ -22,11 +22,10 @@ Commands:
 """
 
 from __future__ import annotations
-import os
 import time
 import logging
 import platform
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 logger = logging.getLogger("agent-zero.plugins.discord.commands")
 
@@ -41,29 +40,100 @@ if TYPE_CHECKING:
     from .bot import DiscordChannelAdapter
 
 
-# ─── Start time for uptime calculation ───
-_start_time = time.time()
+# ─── Start time for uptime calculation (monotonic: immune to wall-clock steps) ───
+_start_time = time.monotonic()
+
+# ─── Process-invariant platform info for /a0 status ───
+_PLATFORM_STR = f"{platform.system()} {platform.release()}"
+_PYTHON_VER = platform.python_version()
+
+# ─── /a0 help entries: (usage, description) ───
+_HELP_ENTRIES: Tuple[Tuple[str, str], ...] = (
+    ("`/a0 help`", "Show this help message"),
+    ("`/a0 status`", "Show bot status, model, and uptime"),
+    ("`/a0 model [name]`", "Switch or list available models"),
+    ("`/a0 reset`", "Clear session and start fresh"),
+    ("`/a0 stop`", "Abort current processing"),
+    ("`/a0 whoami`", "Show your user ID and permissions"),
+    ("`/a0 agents`", "List active sub-agents & thread bindings"),
+    ("`/a0 focus [target]`", "Bind this thread to a sub-agent"),
+    ("`/a0 unfocus`", "Remove thread binding"),
+    ("`/a0 approve [code]`", "Approve a DM pairing code"),
+    ("`/a0 pair`", "Show pending pairing requests"),
+    ("`/a0 subagents [action]`", "Manage sub-agents (list/kill)"),
+    ("`/a0 verbose [on|off]`", "Toggle verbose output"),
+    ("`/a0 usage`", "Show token usage stats"),
+    ("`/a0 config [key] [value]`", "View/modify settings (owner-only)"),
+    ("`/a0 clear`", "Clear message history"),
+)
+
+
+# ─── Discord embed limits ───
+_EMBED_FIELD_VALUE_MAX = 1024
+_EMBED_TOTAL_MAX = 6000
+_EMBED_FIELDS_MAX = 25
+
+
+def _page_lines(lines: List[str], limit: int = _EMBED_FIELD_VALUE_MAX) -> List[str]:
+    """Pack newline-joined lines into pages of at most `limit` chars (oversized lines are cut)."""
+    pages: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        line = line[:limit]
+        added = len(line) + (1 if current else 0)
+        if current and size + added > limit:
+            pages.append("\n".join(current))
+            current, size = [], 0
+            added = len(line)
+        current.append(line)
+        size += added
+    if current:
+        pages.append("\n".join(current))
+    return pages
 
 
 def _format_uptime() -> str:
-    """Format uptime as human-readable string."""
-    elapsed = int(time.time() - _start_time)
-    days, remainder = divmod(elapsed, 86400)
-    hours, remainder = divmod(remainder, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    parts = []
-    if days:
-        parts.append(f"{days}d")
-    if hours:
-        parts.append(f"{hours}h")
-    if minutes:
-        parts.append(f"{minutes}m")
-    parts.append(f"{seconds}s")
-    return " ".join(parts)
+    """Format uptime as human-readable string, omitting zero units (e.g. "2d 5s")."""
+    elapsed = int(time.monotonic() - _start_time)
+    days = elapsed // 86400
+    hours = elapsed // 3600 % 24
+    minutes = elapsed // 60 % 60
+    return (
+        (f"{days}d " if days else "")
+        + (f"{hours}h " if hours else "")
+        + (f"{minutes}m " if minutes else "")
+        + f"{elapsed % 60}s"
+    )
 
 
 if HAS_DISCORD:
 
+    # ─── Fixed slash-command choices (shared, built once at import) ───
+    _VERBOSE_CHOICES = (
+        app_commands.Choice(name="on", value="on"),
+        app_commands.Choice(name="off", value="off"),
+        app_commands.Choice(name="full", value="full"),
+    )
+    _SUBAGENT_ACTIONS = (
+        app_commands.Choice(name="list", value="list"),
+        app_commands.Choice(name="kill all", value="kill_all"),
+    )
+    _CONFIG_ACTIONS = (
+        app_commands.Choice(name="show", value="show"),
+        app_commands.Choice(name="get", value="get"),
+        app_commands.Choice(name="set", value="set"),
+    )
+
+    class OwnerOnly(app_commands.CheckFailure):
+        """Raised when a non-owner invokes an owner-only command."""
+
+    def _owner_only(interaction: discord.Interaction) -> bool:
+        """app_commands check for owner-only commands (open when no owner is configured)."""
+        if interaction.command.binding.is_owner(interaction.user):
+            return True
+        raise OwnerOnly("Owner-only command")
+
     class AgentZeroCommands(app_commands.Group):
         """
         Agent Zero slash commands — registered as /a0 <subcommand>.
@@ -75,74 +145,76 @@ if HAS_DISCORD:
         def __init__(self, adapter: "DiscordChannelAdapter"):
             super().__init__(name="a0", description="Agent Zero commands")
             self.adapter = adapter
-
-        # ─── /a0 help ───
-        @app_commands.command(name="help", description="Show all Agent Zero commands")
-        async def cmd_help(self, interaction: discord.Interaction):
+            self._owner_id = adapter.owner_user_id
+            # Snowflakes compare as ints, so no str(user.id) per interaction
+            try:
+                self._owner_int = int(self._owner_id) if self._owner_id else None
+            except (TypeError, ValueError):
+                self._owner_int = None  # Non-numeric owner ID can never match
+            # Snapshot the adapter's optional managers once instead of probing per command
+            self._sub = getattr(adapter, '_subagent_manager', None)
+            self._tm = getattr(adapter, '_thread_manager', None)
+            self._pm = getattr(adapter, '_pairing_manager', None)
+            self._help_embed = self._build_help_embed()
+
+        def is_owner(self, user) -> bool:
+            """True if no owner is configured or `user` is the configured owner."""
+            return not self._owner_id or user.id == self._owner_int
+
+        @staticmethod
+        def _build_help_embed() -> discord.Embed:
+            """Build the static /a0 help embed (once, at construction)."""
             embed = discord.Embed(
                 title="🤖 Agent Zero Commands",
                 description="Use `/a0 <command>` to interact with Agent Zero.",
                 color=0x5865F2,
             )
-            commands_list = [
-                ("`/a0 help`", "Show this help message"),
-                ("`/a0 status`", "Show bot status, model, and uptime"),
-                ("`/a0 model [name]`", "Switch or list available models"),
-                ("`/a0 reset`", "Clear session and start fresh"),
-                ("`/a0 stop`", "Abort current processing"),
-                ("`/a0 whoami`", "Show your user ID and permissions"),
-                ("`/a0 agents`", "List active sub-agents & thread bindings"),
-                ("`/a0 focus [target]`", "Bind this thread to a sub-agent"),
-                ("`/a0 unfocus`", "Remove thread binding"),
-                ("`/a0 approve [code]`", "Approve a DM pairing code"),
-                ("`/a0 pair`", "Show pending pairing requests"),
-                ("`/a0 subagents [action]`", "Manage sub-agents (list/kill)"),
-                ("`/a0 verbose [on|off]`", "Toggle verbose output"),
-                ("`/a0 usage`", "Show token usage stats"),
-                ("`/a0 config [key] [value]`", "View/modify settings (owner-only)"),
-                ("`/a0 clear`", "Clear message history"),
-            ]
-            for name, desc in commands_list:
+            for name, desc in _HELP_ENTRIES:
                 embed.add_field(name=name, value=desc, inline=False)
             embed.set_footer(text="Agent Zero • OpenClaw-compatible commands")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return embed
+
+        # ─── /a0 help ───
+        @app_commands.command(name="help", description="Show all Agent Zero commands")
+        async def cmd_help(self, interaction: discord.Interaction):
+            await interaction.response.send_message(embed=self._help_embed, ephemeral=True)
 
         # ─── /a0 status ───
         @app_commands.command(name="status", description="Show bot status, active model, and uptime")
         async def cmd_status(self, interaction: discord.Interaction):
             uptime = _format_uptime()
-            guild_count = len(self.adapter._client.guilds) if self.adapter._client else 0
+            guild_count = self.adapter.guild_count
             
             # Try to get current model from settings/env
-            current_model = os.environ.get("CHAT_MODEL", os.environ.get("MODEL_CHAT", "unknown"))
-            util_model = os.environ.get("UTILITY_MODEL", os.environ.get("MODEL_UTILITY", "unknown"))
+            current_model = self.adapter.get_env("CHAT_MODEL", "MODEL_CHAT", default="unknown")
+            util_model = self.adapter.get_env("UTILITY_MODEL", "MODEL_UTILITY", default="unknown")
             
-            embed = discord.Embed(
-                title="📊 Agent Zero Status",
-                color=0x00D26A,
-            )
-            embed.add_field(name="⏱️ Uptime", value=uptime, inline=True)
-            embed.add_field(name="🏠 Servers", value=str(guild_count), inline=True)
-            embed.add_field(name="🧠 Chat Model", value=f"`{current_model}`", inline=False)
-            embed.add_field(name="🔧 Utility Model", value=f"`{util_model}`", inline=False)
-            embed.add_field(name="💻 Platform", value=f"{platform.system()} {platform.release()}", inline=True)
-            embed.add_field(name="🐍 Python", value=platform.python_version(), inline=True)
+            fields = [
+                {"name": "⏱️ Uptime", "value": uptime, "inline": True},
+                {"name": "🏠 Servers", "value": str(guild_count), "inline": True},
+                {"name": "🧠 Chat Model", "value": f"`{current_model}`", "inline": False},
+                {"name": "🔧 Utility Model", "value": f"`{util_model}`", "inline": False},
+                {"name": "💻 Platform", "value": _PLATFORM_STR, "inline": True},
+                {"name": "🐍 Python", "value": _PYTHON_VER, "inline": True},
+            ]
             
             # Sub-agent count
-            if hasattr(self.adapter, '_subagent_manager') and self.adapter._subagent_manager:
-                all_subs = self.adapter._subagent_manager.list_all()
-                embed.add_field(name="🤖 Active Sub-agents", value=str(len(all_subs)), inline=True)
+            if self._sub:
+                all_subs = self._sub.list_all()
+                fields.append({"name": "🤖 Active Sub-agents", "value": str(len(all_subs)), "inline": True})
             
+            embed = discord.Embed.from_dict({
+                "title": "📊 Agent Zero Status",
+                "color": 0x00D26A,
+                "fields": fields,
+            })
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
         # ─── /a0 whoami ───
         @app_commands.command(name="whoami", description="Show your Discord user ID and permissions")
         async def cmd_whoami(self, interaction: discord.Interaction):
             user = interaction.user
-            is_owner = (
-                self.adapter.owner_user_id
-                and str(user.id) == self.adapter.owner_user_id
-            )
+            is_owner = self._owner_int is not None and user.id == self._owner_int
             
             embed = discord.Embed(
                 title="👤 Who Am I",
@@ -153,12 +225,10 @@ if HAS_DISCORD:
             embed.add_field(name="Is Owner", value="✅ Yes" if is_owner else "❌ No", inline=True)
             
             if interaction.guild:
-                roles = [r.name for r in user.roles if r.name != "@everyone"]
-                embed.add_field(
-                    name="Roles",
-                    value=", ".join(f"`{r}`" for r in roles) if roles else "None",
-                    inline=False,
-                )
+                roles_str = ", ".join([
+                    f"`{r.name}`" for r in user.roles if r.name != "@everyone"
+                ]) or "None"
+                embed.add_field(name="Roles", value=roles_str, inline=False)
                 embed.add_field(name="Guild ID", value=f"`{interaction.guild.id}`", inline=True)
                 embed.add_field(name="Channel ID", value=f"`{interaction.channel.id}`", inline=True)
 
@@ -170,7 +240,7 @@ if HAS_DISCORD:
         async def cmd_model(self, interaction: discord.Interaction, name: Optional[str] = None):
             if name is None:
                 # Show current model
-                current = os.environ.get("CHAT_MODEL", os.environ.get("MODEL_CHAT", "not set"))
+                current = self.adapter.get_env("CHAT_MODEL", "MODEL_CHAT", default="not set")
                 await interaction.response.send_message(
                     f"🧠 **Current model:** `{current}`\n"
                     f"Use `/a0 model <name>` to switch.",
@@ -178,8 +248,8 @@ if HAS_DISCORD:
                 )
             else:
                 # Set model via env (will take effect on next message)
-                os.environ["CHAT_MODEL"] = name
-                os.environ["MODEL_CHAT"] = name
+                self.adapter.set_env("CHAT_MODEL", name)
+                self.adapter.set_env("MODEL_CHAT", name)
                 await interaction.response.send_message(
                     f"✅ Model switched to: `{name}`\n"
                     f"This will take effect on the next message.",
@@ -190,47 +260,38 @@ if HAS_DISCORD:
         @app_commands.command(name="reset", description="Clear session context and start fresh")
         async def cmd_reset(self, interaction: discord.Interaction):
             # Signal to the adapter that this session should be cleared
-            channel_id = str(interaction.channel.id)
-            if hasattr(self.adapter, '_session_reset_channels'):
-                self.adapter._session_reset_channels.add(channel_id)
+            self.adapter._session_reset_channels.add(interaction.channel.id)
             await interaction.response.send_message(
                 "🔄 **Session reset.** Context cleared — next message starts fresh.",
-                ephemeral=False,
+                ephemeral=True,
             )
 
         # ─── /a0 stop ───
         @app_commands.command(name="stop", description="Abort current processing")
         async def cmd_stop(self, interaction: discord.Interaction):
             # Set abort flag for current processing
-            if hasattr(self.adapter, '_abort_channels'):
-                self.adapter._abort_channels.add(str(interaction.channel.id))
+            self.adapter._abort_channels.add(interaction.channel.id)
             await interaction.response.send_message(
                 "🛑 **Stop requested.** Current processing will be aborted.",
-                ephemeral=False,
+                ephemeral=True,
             )
 
         # ─── /a0 clear ───
         @app_commands.command(name="clear", description="Clear message history for this channel")
         async def cmd_clear(self, interaction: discord.Interaction):
-            channel_id = str(interaction.channel.id)
-            if hasattr(self.adapter, '_session_reset_channels'):
-                self.adapter._session_reset_channels.add(channel_id)
+            self.adapter._session_reset_channels.add(interaction.channel.id)
             await interaction.response.send_message(
                 "🧹 **History cleared.** All previous context has been removed.",
-                ephemeral=False,
+                ephemeral=True,
             )
 
         # ─── /a0 verbose ───
         @app_commands.command(name="verbose", description="Toggle verbose output mode")
         @app_commands.describe(mode="on, off, or full")
-        @app_commands.choices(mode=[
-            app_commands.Choice(name="on", value="on"),
-            app_commands.Choice(name="off", value="off"),
-            app_commands.Choice(name="full", value="full"),
-        ])
+        @app_commands.choices(mode=list(_VERBOSE_CHOICES))
         async def cmd_verbose(self, interaction: discord.Interaction, mode: Optional[app_commands.Choice[str]] = None):
             if mode is None:
-                current = getattr(self.adapter, '_verbose_mode', 'off')
+                current = self.adapter._verbose_mode
                 await interaction.response.send_message(
                     f"📝 **Verbose mode:** `{current}`",
                     ephemeral=True,
@@ -246,7 +307,7 @@ if HAS_DISCORD:
         # ─── /a0 usage ───
         @app_commands.command(name="usage", description="Show token usage statistics")
         async def cmd_usage(self, interaction: discord.Interaction):
-            stats = getattr(self.adapter, '_usage_stats', {})
+            stats = self.adapter._usage_stats
             if not stats:
                 await interaction.response.send_message(
                     "📊 No usage data available yet. Send some messages first!",
@@ -254,83 +315,97 @@ if HAS_DISCORD:
                 )
                 return
             
-            embed = discord.Embed(title="📊 Token Usage", color=0xFFA500)
-            embed.add_field(
-                name="Prompt Tokens",
-                value=f"`{stats.get('prompt_tokens', 0):,}`",
-                inline=True,
-            )
-            embed.add_field(
-                name="Completion Tokens",
-                value=f"`{stats.get('completion_tokens', 0):,}`",
-                inline=True,
-            )
-            embed.add_field(
-                name="Total",
-                value=f"`{stats.get('total_tokens', 0):,}`",
-                inline=True,
-            )
-            embed.add_field(
-                name="Messages",
-                value=f"`{stats.get('message_count', 0)}`",
-                inline=True,
-            )
+            # Counter: missing keys read as 0
+            prompt = stats["prompt_tokens"]
+            completion = stats["completion_tokens"]
+            total = stats["total_tokens"]
+            messages = stats["message_count"]
+            embed = discord.Embed.from_dict({
+                "title": "📊 Token Usage",
+                "color": 0xFFA500,
+                "fields": [
+                    {"name": "Prompt Tokens", "value": f"`{format(prompt, ',')}`", "inline": True},
+                    {"name": "Completion Tokens", "value": f"`{format(completion, ',')}`", "inline": True},
+                    {"name": "Total", "value": f"`{format(total, ',')}`", "inline": True},
+                    {"name": "Messages", "value": f"`{messages}`", "inline": True},
+                ],
+            })
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
         # ─── /a0 agents ───
         @app_commands.command(name="agents", description="List active sub-agents and thread bindings")
         async def cmd_agents(self, interaction: discord.Interaction):
-            embed = discord.Embed(title="🤖 Agents & Thread Bindings", color=0x5865F2)
+            fields = []
             
             # Sub-agents
-            if hasattr(self.adapter, '_subagent_manager') and self.adapter._subagent_manager:
-                all_agents = self.adapter._subagent_manager.list_all()
+            if self._sub:
+                all_agents = self._sub.list_all()
                 if all_agents:
                     for parent_id, children in all_agents.items():
-                        child_list = "\n".join(
+                        child_list = "\n".join([
                             f"• `{cid}` — {info.get('name', 'unnamed')}"
                             for cid, info in children.items()
-                        )
-                        embed.add_field(
-                            name=f"Parent: `{parent_id}`",
-                            value=child_list or "No children",
-                            inline=False,
-                        )
+                        ])
+                        fields.append({
+                            "name": f"Parent: `{parent_id}`",
+                            "value": child_list or "No children",
+                            "inline": False,
+                        })
                 else:
-                    embed.add_field(name="Sub-Agents", value="No active sub-agents", inline=False)
+                    fields.append({"name": "Sub-Agents", "value": "No active sub-agents", "inline": False})
             
             # Thread bindings
-            if hasattr(self.adapter, '_thread_manager'):
-                tm = self.adapter._thread_manager
+            tm = self._tm
+            if tm:
                 bindings = tm.list_bindings()
                 if bindings:
-                    binding_lines = []
-                    for b in bindings:
-                        idle = round((time.time() - b.last_active) / 3600, 1)
-                        binding_lines.append(
-                            f"• <#{b.thread_id}> → `{b.target}` "
-                            f"({b.message_count} msgs, idle {idle}h)"
-                        )
-                    embed.add_field(
-                        name=f"🔗 Thread Bindings ({len(bindings)})",
-                        value="\n".join(binding_lines),
-                        inline=False,
-                    )
+                    now = time.monotonic()
+                    binding_lines = [
+                        f"• <#{b.thread_id}> → `{b.target}` "
+                        f"({b.message_count} msgs, idle {round((now - b.mono_last_active) / 3600, 1)}h)"
+                        for b in bindings
+                    ]
+                    pages = _page_lines(binding_lines)
+                    title = f"🔗 Thread Bindings ({len(bindings)})"
+                    for n, page in enumerate(pages, 1):
+                        fields.append({
+                            "name": title if len(pages) == 1 else f"{title} (page {n})",
+                            "value": page,
+                            "inline": False,
+                        })
                 else:
-                    embed.add_field(
-                        name="🔗 Thread Bindings",
-                        value="No active bindings",
-                        inline=False,
-                    )
+                    fields.append({"name": "🔗 Thread Bindings", "value": "No active bindings", "inline": False})
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            # Many bindings can overflow a single embed: split fields across
+            # embeds under Discord's total-size and field-count limits
+            title = "🤖 Agents & Thread Bindings"
+            embeds = []
+            batch: List[dict] = []
+            size = len(title)
+            for field in fields:
+                field_size = len(field["name"]) + len(field["value"])
+                if batch and (size + field_size > _EMBED_TOTAL_MAX or len(batch) >= _EMBED_FIELDS_MAX):
+                    embeds.append(batch)
+                    batch, size = [], len(title)
+                batch.append(field)
+                size += field_size
+            embeds.append(batch)
+            
+            await interaction.response.defer(ephemeral=True)
+            for batch in embeds:
+                embed = discord.Embed.from_dict({
+                    "title": title,
+                    "color": 0x5865F2,
+                    "fields": batch,
+                })
+                await interaction.followup.send(embed=embed, ephemeral=True)
 
         # ─── /a0 focus ───
         @app_commands.command(name="focus", description="Bind this thread to a sub-agent or session target")
         @app_commands.describe(target="Sub-agent ID or session key to bind to this thread")
         async def cmd_focus(self, interaction: discord.Interaction, target: str):
             # Check if thread manager is available
-            tm = getattr(self.adapter, '_thread_manager', None)
+            tm = self._tm
             if tm is None:
                 await interaction.response.send_message(
                     "❌ Thread bindings are not enabled. "
@@ -340,24 +415,29 @@ if HAS_DISCORD:
                 return
             
             channel = interaction.channel
+            # Binding owner fields, converted once for whichever branch binds
+            user_id = str(interaction.user.id)
+            guild_id = str(interaction.guild_id) if interaction.guild_id else None
             
             # If not in a thread, create one
             if not isinstance(channel, (discord.Thread,)):
                 if isinstance(channel, discord.TextChannel):
+                    # Thread creation is a REST round-trip — acknowledge first
+                    # so we don't miss Discord's 3s initial-response deadline
+                    await interaction.response.defer(ephemeral=False)
                     thread = await channel.create_thread(
                         name=f"🤖 {target}"[:100],
                         type=discord.ChannelType.public_thread,
                     )
                     tm.bind(
-                        thread_id=str(thread.id),
+                        thread_id=thread.id,
                         target=target,
-                        user_id=str(interaction.user.id),
-                        guild_id=str(interaction.guild_id) if interaction.guild_id else None,
+                        user_id=user_id,
+                        guild_id=guild_id,
                         metadata={"auto_created": True},
                     )
-                    await interaction.response.send_message(
+                    await interaction.followup.send(
                         f"🔗 Created and bound thread {thread.mention} → `{target}`",
-                        ephemeral=False,
                     )
                     await thread.send(
                         f"🔗 **Thread bound to:** `{target}`\n"
@@ -373,20 +453,20 @@ if HAS_DISCORD:
             
             # Already in a thread — bind it
             tm.bind(
-                thread_id=str(channel.id),
+                thread_id=channel.id,
                 target=target,
-                user_id=str(interaction.user.id),
-                guild_id=str(interaction.guild_id) if interaction.guild_id else None,
+                user_id=user_id,
+                guild_id=guild_id,
             )
             await interaction.response.send_message(
                 f"🔗 **Thread bound** → `{target}`\nAll messages here now route to this target.",
-                ephemeral=False,
+                ephemeral=True,
             )
 
         # ─── /a0 unfocus ───
         @app_commands.command(name="unfocus", description="Remove the current thread binding")
         async def cmd_unfocus(self, interaction: discord.Interaction):
-            tm = getattr(self.adapter, '_thread_manager', None)
+            tm = self._tm
             if tm is None:
                 await interaction.response.send_message(
                     "❌ Thread bindings are not enabled.",
@@ -394,16 +474,13 @@ if HAS_DISCORD:
                 )
                 return
             
-            channel = interaction.channel
-            thread_id = str(channel.id)
-            
-            binding = tm.unbind(thread_id)
+            binding = tm.unbind(interaction.channel.id)
             if binding:
                 await interaction.response.send_message(
                     f"🔓 **Thread unbound** from `{binding.target}`.\n"
                     f"Had {binding.message_count} messages. "
                     "Messages here will route normally.",
-                    ephemeral=False,
+                    ephemeral=True,
                 )
             else:
                 await interaction.response.send_message(
@@ -414,10 +491,7 @@ if HAS_DISCORD:
         # ─── /a0 subagents ───
         @app_commands.command(name="subagents", description="Manage sub-agents (list, kill)")
         @app_commands.describe(action="Action to perform")
-        @app_commands.choices(action=[
-            app_commands.Choice(name="list", value="list"),
-            app_commands.Choice(name="kill all", value="kill_all"),
-        ])
+        @app_commands.choices(action=list(_SUBAGENT_ACTIONS))
         async def cmd_subagents(
             self,
             interaction: discord.Interaction,
@@ -428,15 +502,12 @@ if HAS_DISCORD:
                 return
             
             if action.value == "kill_all":
-                if hasattr(self.adapter, '_subagent_manager') and self.adapter._subagent_manager:
+                if self._sub:
                     # Clear all sub-agents
-                    mgr = self.adapter._subagent_manager
-                    all_agents = mgr.list_all()
-                    count = sum(len(children) for children in all_agents.values())
-                    mgr._children.clear()
+                    count = self._sub.kill_all()
                     await interaction.response.send_message(
                         f"🛑 Killed **{count}** sub-agent(s).",
-                        ephemeral=False,
+                        ephemeral=True,
                     )
                 else:
                     await interaction.response.send_message(
@@ -451,11 +522,8 @@ if HAS_DISCORD:
             key="Config key (for get/set)",
             value="New value (for set)",
         )
-        @app_commands.choices(action=[
-            app_commands.Choice(name="show", value="show"),
-            app_commands.Choice(name="get", value="get"),
-            app_commands.Choice(name="set", value="set"),
-        ])
+        @app_commands.choices(action=list(_CONFIG_ACTIONS))
+        @app_commands.check(_owner_only)
         async def cmd_config(
             self,
             interaction: discord.Interaction,
@@ -463,29 +531,26 @@ if HAS_DISCORD:
             key: Optional[str] = None,
             value: Optional[str] = None,
         ):
-            # Owner-only check
-            if self.adapter.owner_user_id and str(interaction.user.id) != self.adapter.owner_user_id:
-                await interaction.response.send_message(
-                    "🔒 **Owner-only command.** You are not authorized.",
-                    ephemeral=True,
-                )
-                return
-            
             if action.value == "show":
                 config_items = {
                     "owner_user_id": self.adapter.owner_user_id or "not set",
                     "command_prefix": self.adapter.command_prefix,
                     "respond_to_dms": str(self.adapter.respond_to_dms),
                     "respond_to_mentions": str(self.adapter.respond_to_mentions),
-                    "verbose_mode": getattr(self.adapter, '_verbose_mode', 'off'),
-                    "thread_bindings": f"{len(self.adapter._thread_manager.list_bindings())} active" if hasattr(self.adapter, '_thread_manager') else "disabled",
-                    "dm_policy": self.adapter._pairing_manager.policy if hasattr(self.adapter, '_pairing_manager') else "unknown",
-                    "allowed_users": str(len(self.adapter._pairing_manager.list_allowed())) if hasattr(self.adapter, '_pairing_manager') else "unknown",
-                    "pending_pairing": str(len(self.adapter._pairing_manager.list_pending())) if hasattr(self.adapter, '_pairing_manager') else "0",
+                    "verbose_mode": self.adapter._verbose_mode,
+                    "thread_bindings": f"{len(self._tm.list_bindings())} active" if self._tm else "disabled",
+                    "dm_policy": self._pm.policy if self._pm else "unknown",
+                    "allowed_users": str(len(self._pm.list_allowed())) if self._pm else "unknown",
+                    "pending_pairing": str(len(self._pm.list_pending())) if self._pm else "0",
                 }
-                embed = discord.Embed(title="⚙️ Configuration", color=0x5865F2)
-                for k, v in config_items.items():
-                    embed.add_field(name=f"`{k}`", value=f"`{v}`", inline=True)
+                embed = discord.Embed.from_dict({
+                    "title": "⚙️ Configuration",
+                    "color": 0x5865F2,
+                    "fields": [
+                        {"name": f"`{k}`", "value": f"`{v}`", "inline": True}
+                        for k, v in config_items.items()
+                    ],
+                })
                 await interaction.response.send_message(embed=embed, ephemeral=True)
             
             elif action.value == "get":
@@ -497,7 +562,7 @@ if HAS_DISCORD:
                     return
                 val = getattr(self.adapter, key, None)
                 if val is None:
-                    val = os.environ.get(key, "not found")
+                    val = self.adapter.get_env(key, default="not found")
                 await interaction.response.send_message(
                     f"⚙️ `{key}` = `{val}`",
                     ephemeral=True,
@@ -511,7 +576,7 @@ if HAS_DISCORD:
                     )
                     return
                 # Apply to env for runtime override
-                os.environ[key] = value
+                self.adapter.set_env(key, value)
                 await interaction.response.send_message(
                     f"✅ Set `{key}` = `{value}` (runtime override)",
                     ephemeral=True,
@@ -520,16 +585,9 @@ if HAS_DISCORD:
         # ─── /a0 approve ───
         @app_commands.command(name="approve", description="Approve a DM pairing code (owner-only)")
         @app_commands.describe(code="The pairing code to approve")
+        @app_commands.check(_owner_only)
         async def cmd_approve(self, interaction: discord.Interaction, code: str):
-            # Owner-only
-            if self.adapter.owner_user_id and str(interaction.user.id) != self.adapter.owner_user_id:
-                await interaction.response.send_message(
-                    "🔒 **Owner-only command.** You are not authorized.",
-                    ephemeral=True,
-                )
-                return
-            
-            pm = getattr(self.adapter, '_pairing_manager', None)
+            pm = self._pm
             if pm is None:
                 await interaction.response.send_message(
                     "❌ Pairing manager is not available.",
@@ -542,7 +600,7 @@ if HAS_DISCORD:
                 await interaction.response.send_message(
                     f"✅ **Approved!** User `{request.sender_name}` "
                     f"(`{request.sender_id}`) can now DM the bot.",
-                    ephemeral=False,
+                    ephemeral=True,
                 )
                 # Notify the user in DM
                 try:
@@ -561,16 +619,9 @@ if HAS_DISCORD:
 
         # ─── /a0 pair ───
         @app_commands.command(name="pair", description="Show pending pairing requests (owner-only)")
+        @app_commands.check(_owner_only)
         async def cmd_pair(self, interaction: discord.Interaction):
-            # Owner-only
-            if self.adapter.owner_user_id and str(interaction.user.id) != self.adapter.owner_user_id:
-                await interaction.response.send_message(
-                    "🔒 **Owner-only command.** You are not authorized.",
-                    ephemeral=True,
-                )
-                return
-            
-            pm = getattr(self.adapter, '_pairing_manager', None)
+            pm = self._pm
             if pm is None:
                 await interaction.response.send_message(
                     "❌ Pairing manager is not available.",
@@ -586,20 +637,22 @@ if HAS_DISCORD:
                 )
                 return
             
-            embed = discord.Embed(
-                title="🔐 Pending Pairing Requests",
-                color=0xFFA500,
-            )
-            for req in pending:
-                embed.add_field(
-                    name=f"`{req.code}`",
-                    value=(
-                        f"**User:** {req.sender_name} (`{req.sender_id}`)\n"
-                        f"**Expires in:** {req.remaining_minutes()} min"
-                    ),
-                    inline=False,
-                )
-            embed.set_footer(text="Use /a0 approve <code> to approve")
+            embed = discord.Embed.from_dict({
+                "title": "🔐 Pending Pairing Requests",
+                "color": 0xFFA500,
+                "fields": [
+                    {
+                        "name": f"`{req.code}`",
+                        "value": (
+                            f"**User:** {req.sender_name} (`{req.sender_id}`)\n"
+                            f"**Expires in:** {req.remaining_minutes()} min"
+                        ),
+                        "inline": False,
+                    }
+                    for req in pending
+                ],
+                "footer": {"text": "Use /a0 approve <code> to approve"},
+            })
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
 
@@ -607,6 +660,19 @@ if HAS_DISCORD:
         """Register all Agent Zero slash commands on the command tree."""
         group = AgentZeroCommands(adapter=adapter)
         tree.add_command(group)
+
+        @tree.error
+        async def on_app_command_error(
+            interaction: discord.Interaction, error: app_commands.AppCommandError
+        ):
+            if isinstance(error, OwnerOnly):
+                await interaction.response.send_message(
+                    "🔒 **Owner-only command.** You are not authorized.",
+                    ephemeral=True,
+                )
+                return
+            logger.error(f"Slash command error: {error}", exc_info=error)
+
         logger.info("Registered /a0 slash command group")
         return group
 
@@ -15,9 +15,11 @@ Features:
 
 from __future__ import annotations
 import asyncio
+import itertools
 import logging
-import uuid
-from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 logger = logging.getLogger("agent-zero.plugins.discord.components")
 
@@ -32,8 +34,79 @@ if TYPE_CHECKING:
     from .bot import DiscordChannelAdapter
 
 
+# ─── Component custom_ids: process-random salt XOR a counter (unique per process) ───
+_id_salt = int.from_bytes(os.urandom(4), "big")
+_id_counter = itertools.count()
+
+
+def _gen_custom_id(prefix: str) -> str:
+    """Return a fresh custom_id like "a0_btn_1f3a9c07" without a uuid4() per component."""
+    return f"{prefix}{(_id_salt ^ next(_id_counter)) & 0xFFFFFFFF:08x}"
+
+
 if HAS_DISCORD:
 
+    # InputModal field "style" -> TextStyle (anything else is short)
+    _STYLE_MAP = {
+        "long": discord.TextStyle.long,
+        "short": discord.TextStyle.short,
+    }
+
+    # ─── Unauthorized clicks: answer once per cooldown, drop repeats with no REST call ───
+    _REJECT_COOLDOWN_SECONDS = 10.0
+    _REJECT_CACHE_MAX = 4096
+    _reject_cache: Dict[Tuple[str, str], float] = {}  # (custom_id, user_id) -> last reply
+
+    async def _reject(interaction: discord.Interaction, custom_id: str, user_id: str, message: str):
+        """Tell an unauthorized user once per cooldown; silently ignore spam clicks."""
+        now = time.monotonic()
+        key = (custom_id, user_id)
+        if now - _reject_cache.get(key, float("-inf")) < _REJECT_COOLDOWN_SECONDS:
+            return  # Already told them recently
+        if len(_reject_cache) >= _REJECT_CACHE_MAX:
+            stale = [k for k, t in _reject_cache.items() if now - t >= _REJECT_COOLDOWN_SECONDS]
+            for k in stale:
+                del _reject_cache[k]
+        _reject_cache[key] = now
+        await interaction.response.send_message(message, ephemeral=True)
+
+    # Background component callbacks, referenced until done so they aren't GC'd
+    _callback_tasks: Set[asyncio.Task] = set()
+
+    async def _safe_invoke(interaction: discord.Interaction, callback_fn: Callable, *args):
+        """Run a deferred component callback, reporting failures via followup."""
+        try:
+            await callback_fn(interaction, *args)
+        except Exception as e:
+            logger.error(f"Component callback failed: {e}", exc_info=True)
+            try:
+                await interaction.followup.send("❌ Something went wrong.", ephemeral=True)
+            except Exception:
+                pass  # Best effort: the interaction token may have expired
+
+    async def _run_callback(
+        interaction: discord.Interaction,
+        defer_mode: str,
+        callback_fn: Callable,
+        *args,
+    ):
+        """
+        Invoke a component callback per `defer_mode`:
+          - "none"      — await it inline (it must respond within Discord's 3s)
+          - "ephemeral" / "public" — acknowledge now with a deferred "thinking"
+            response, then run it in the background; it replies via followup
+        """
+        if defer_mode == "none":
+            await callback_fn(interaction, *args)
+            return
+        if not interaction.response.is_done():
+            await interaction.response.defer(
+                ephemeral=(defer_mode == "ephemeral"), thinking=True,
+            )
+        task = asyncio.ensure_future(_safe_invoke(interaction, callback_fn, *args))
+        _callback_tasks.add(task)
+        task.add_done_callback(_callback_tasks.discard)
+
     class ActionButton(ui.Button):
         """A button with an attached async callback."""
 
@@ -46,29 +119,33 @@ if HAS_DISCORD:
             disabled: bool = False,
             allowed_users: Optional[List[str]] = None,
             callback_fn: Optional[Callable] = None,
+            defer_mode: str = "none",
         ):
             super().__init__(
                 label=label,
                 style=style,
                 emoji=emoji,
-                custom_id=custom_id or f"a0_btn_{uuid.uuid4().hex[:8]}",
+                custom_id=custom_id or _gen_custom_id("a0_btn_"),
                 disabled=disabled,
             )
-            self._allowed_users = allowed_users
+            # Normalized once: O(1) per-click membership, None = unrestricted
+            self._allowed_users = frozenset(map(str, allowed_users)) if allowed_users else None
             self._callback_fn = callback_fn
+            self._defer_mode = defer_mode  # "none", "ephemeral" or "public"
 
         async def callback(self, interaction: discord.Interaction):
             # Check user restriction
-            if self._allowed_users:
-                if str(interaction.user.id) not in self._allowed_users:
-                    await interaction.response.send_message(
+            if self._allowed_users is not None:
+                user_id = str(interaction.user.id)
+                if user_id not in self._allowed_users:
+                    await _reject(
+                        interaction, self.custom_id, user_id,
                         "❌ You are not authorized to use this button.",
-                        ephemeral=True,
                     )
                     return
 
             if self._callback_fn:
-                await self._callback_fn(interaction, self)
+                await _run_callback(interaction, self._defer_mode, self._callback_fn, self)
             else:
                 await interaction.response.send_message(
                     f"Button `{self.label}` pressed.", ephemeral=True
@@ -86,27 +163,32 @@ if HAS_DISCORD:
             custom_id: Optional[str] = None,
             allowed_users: Optional[List[str]] = None,
             callback_fn: Optional[Callable] = None,
+            defer_mode: str = "none",
         ):
             super().__init__(
                 placeholder=placeholder,
                 options=options or [],
                 min_values=min_values,
                 max_values=max_values,
-                custom_id=custom_id or f"a0_sel_{uuid.uuid4().hex[:8]}",
+                custom_id=custom_id or _gen_custom_id("a0_sel_"),
             )
-            self._allowed_users = allowed_users
+            # Normalized once: O(1) per-click membership, None = unrestricted
+            self._allowed_users = frozenset(map(str, allowed_users)) if allowed_users else None
             self._callback_fn = callback_fn
+            self._defer_mode = defer_mode  # "none", "ephemeral" or "public"
 
         async def callback(self, interaction: discord.Interaction):
-            if self._allowed_users:
-                if str(interaction.user.id) not in self._allowed_users:
-                    await interaction.response.send_message(
-                        "❌ You are not authorized.", ephemeral=True,
+            if self._allowed_users is not None:
+                user_id = str(interaction.user.id)
+                if user_id not in self._allowed_users:
+                    await _reject(
+                        interaction, self.custom_id, user_id,
+                        "❌ You are not authorized.",
                     )
                     return
 
             if self._callback_fn:
-                await self._callback_fn(interaction, self.values)
+                await _run_callback(interaction, self._defer_mode, self._callback_fn, self.values)
             else:
                 await interaction.response.send_message(
                     f"Selected: {', '.join(self.values)}", ephemeral=True
@@ -139,6 +221,7 @@ if HAS_DISCORD:
             disabled: bool = False,
             allowed_users: Optional[List[str]] = None,
             callback_fn: Optional[Callable] = None,
+            defer_mode: str = "none",
         ) -> "ComponentView":
             """Add a button to this view. Returns self for chaining."""
             self.add_item(ActionButton(
@@ -148,6 +231,7 @@ if HAS_DISCORD:
                 disabled=disabled,
                 allowed_users=allowed_users,
                 callback_fn=callback_fn,
+                defer_mode=defer_mode,
             ))
             return self
 
@@ -159,6 +243,7 @@ if HAS_DISCORD:
             max_values: int = 1,
             allowed_users: Optional[List[str]] = None,
             callback_fn: Optional[Callable] = None,
+            defer_mode: str = "none",
         ) -> "ComponentView":
             """Add a select menu. Returns self for chaining."""
             self.add_item(StringSelect(
@@ -168,6 +253,7 @@ if HAS_DISCORD:
                 max_values=max_values,
                 allowed_users=allowed_users,
                 callback_fn=callback_fn,
+                defer_mode=defer_mode,
             ))
             return self
 
@@ -204,11 +290,7 @@ if HAS_DISCORD:
             self._field_refs: List[ui.TextInput] = []
 
             for f in (fields or []):
-                style = (
-                    discord.TextStyle.long
-                    if f.get("style") == "long"
-                    else discord.TextStyle.short
-                )
+                style = _STYLE_MAP.get(f.get("style"), discord.TextStyle.short)
                 text_input = ui.TextInput(
                     label=f.get("label", "Input"),
                     placeholder=f.get("placeholder", ""),
@@ -219,11 +301,10 @@ if HAS_DISCORD:
                 )
                 self.add_item(text_input)
                 self._field_refs.append(text_input)
+            self._labels = tuple(ref.label for ref in self._field_refs)
 
         async def on_submit(self, interaction: discord.Interaction):
-            values = {
-                ref.label: ref.value for ref in self._field_refs
-            }
+            values = dict(zip(self._labels, (ref.value for ref in self._field_refs)))
             if self._callback_fn:
                 await self._callback_fn(interaction, values)
             else:
@@ -17,35 +17,69 @@ Security properties (matching OpenClaw):
 
 from __future__ import annotations
 import asyncio
+import heapq
 import json
 import logging
 import os
-import random
-import string
+import secrets
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger("agent-zero.plugins.discord.pairing")
 
+# Optional: orjson parses/serializes the allowlist several times faster
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Characters for pairing codes — exclude 0, O, 1, I
 _SAFE_CHARS = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+_SAFE_BYTES = _SAFE_CHARS.encode("ascii")
+# A 32-char alphabet lets each random byte map to a char with `& 0x1F`, uniformly
+_SAFE_MASKABLE = len(_SAFE_CHARS) == 32
+
+# Separators users may type inside a code ("abcd-2345", "ABCD 2345")
+_CODE_SEPARATORS = str.maketrans("", "", " -\t\n")
+
+
+def _canon_code(code: str) -> str:
+    """Normalize a user-typed pairing code to the stored uppercase form."""
+    if code.isalnum() and code.isupper():
+        return code  # Already canonical (the common copy-paste case)
+    # strip() catches any surrounding whitespace (\r, NBSP, ...) the table misses
+    return code.strip().translate(_CODE_SEPARATORS).upper()
+
+
+# Allowlist changes within this window are coalesced into one disk write
+_SAVE_DELAY_SECONDS = 1.5
 
 
-@dataclass
+@dataclass(slots=True)
 class PairingRequest:
     """A pending pairing request."""
     code: str
     sender_id: str
     sender_name: str
     channel_id: str  # Where the approval notification was sent
-    created_at: float = field(default_factory=time.time)
-    expires_at: float = 0.0
+    created_at: float
+    expires_at: float
 
-    def __post_init__(self):
-        if self.expires_at == 0.0:
-            self.expires_at = self.created_at + 3600  # 1 hour
+    @classmethod
+    def create(
+        cls,
+        code: str,
+        sender_id: str,
+        sender_name: str,
+        channel_id: str,
+        ttl: float,
+    ) -> "PairingRequest":
+        """Build a request created now that expires after `ttl` seconds."""
+        now = time.time()
+        return cls(code, sender_id, sender_name, channel_id, now, now + ttl)
 
     def is_expired(self) -> bool:
         return time.time() >= self.expires_at
@@ -63,6 +97,12 @@ class PairingManager:
       - "owner"    — only the specified owner_user_id
       - "pairing"  — new users must be paired via code approval
       - "disabled" — DMs are completely disabled
+
+    Concurrency: every public method is synchronous and must be called from
+    the event loop thread. None of them await, so each mutation of the pending
+    indexes and allow/block lists runs atomically with respect to other
+    handlers; no lock is needed. Reads go through the immutable _fast_allow
+    snapshot, and the background save only ever sees copies.
     """
 
     def __init__(
@@ -74,8 +114,6 @@ class PairingManager:
         code_length: int = 8,
         code_ttl_seconds: int = 3600,
     ):
-        self.policy = policy
-        self.owner_user_id = owner_user_id
         self._data_dir = Path(data_dir)
         self._max_pending = max_pending_per_channel
         self._code_length = code_length
@@ -83,40 +121,74 @@ class PairingManager:
 
         # State
         self._pending: Dict[str, PairingRequest] = {}  # code -> request
+        # Reverse indexes over _pending, kept in step by _add_request/_drop_request
+        self._pending_by_sender: Dict[str, str] = {}  # sender_id -> code
+        self._pending_by_channel: Dict[str, Set[str]] = {}  # channel_id -> codes
+        # (expires_at, code) min-heap; entries for already-removed codes are skipped lazily
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._allowlist: Set[str] = set()  # approved user IDs
         self._blocklist: Set[str] = set()  # blocked user IDs
 
-        # Load persisted allowlist
-        self._load_allowlist()
+        # Policy and owner feed the fast-allow set, rebuilt by the policy setter
+        self._owner_user_id = owner_user_id
+        self.policy = policy
+
+        # Debounced persistence (see _schedule_save)
+        self._save_dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+
+        # The persisted allowlist is read by `await load()` at bot startup,
+        # keeping file I/O out of the constructor
 
     # ─── Authorization ───
 
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @policy.setter
+    def policy(self, value: str):
+        self._policy = value
+        self._rebuild_fast_allow()
+
+    @property
+    def owner_user_id(self) -> Optional[str]:
+        return self._owner_user_id
+
+    @owner_user_id.setter
+    def owner_user_id(self, value: Optional[str]):
+        self._owner_user_id = value
+        self._rebuild_fast_allow()
+
+    def _rebuild_fast_allow(self):
+        """
+        Resolve the policy into the set of users it admits, so is_authorized
+        is one set lookup. Called whenever the policy, owner or allowlist changes.
+        """
+        policy = self._policy
+        allowed = set(self._allowlist) if policy == "pairing" else set()
+        # Owner is always authorized under "owner" and "pairing"
+        if policy in ("owner", "pairing") and self._owner_user_id:
+            allowed.add(self._owner_user_id)
+        self._fast_allow = frozenset(allowed)
+        self._admit_all = policy == "open"
+
     def is_authorized(self, user_id: str) -> bool:
         """Check if a user is authorized to DM the bot."""
-        if self.policy == "open":
+        if user_id in self._fast_allow:
             return True
-        if self.policy == "disabled":
-            return False
-        if self.policy == "owner":
-            return user_id == self.owner_user_id
-        if self.policy == "pairing":
-            # Owner is always authorized
-            if user_id == self.owner_user_id:
-                return True
-            # Check allowlist
-            if user_id in self._allowlist:
-                return True
-            # Check blocklist
-            if user_id in self._blocklist:
-                return False
-            return False
-        return False
+        # Owner, allowlist and blocklist are all resolved above; only "open"
+        # admits anyone else ("disabled" and unknown policies deny)
+        return self._admit_all
 
     # ─── Pairing codes ───
 
     def generate_code(self) -> str:
-        """Generate a random pairing code."""
-        return "".join(random.choices(_SAFE_CHARS, k=self._code_length))
+        """Generate a random pairing code (CSPRNG: codes grant DM access)."""
+        if _SAFE_MASKABLE:
+            raw = secrets.token_bytes(self._code_length)
+            return bytes(_SAFE_BYTES[b & 0x1F] for b in raw).decode("ascii")
+        return "".join(secrets.choice(_SAFE_CHARS) for _ in range(self._code_length))
 
     def create_request(
         self,
@@ -136,20 +208,15 @@ class PairingManager:
         if self.is_authorized(sender_id):
             return None
 
-        # Already has pending request?
-        for req in self._pending.values():
-            if req.sender_id == sender_id and not req.is_expired():
-                return None  # Don't send duplicate requests
-
-        # Clean expired requests first
+        # Clean expired requests first, so the indexes only hold live ones
         self._cleanup_expired()
 
+        # Already has pending request?
+        if sender_id in self._pending_by_sender:
+            return None  # Don't send duplicate requests
+
         # Check channel limits
-        channel_pending = sum(
-            1 for r in self._pending.values()
-            if r.channel_id == channel_id and not r.is_expired()
-        )
-        if channel_pending >= self._max_pending:
+        if len(self._pending_by_channel.get(channel_id, ())) >= self._max_pending:
             logger.warning(
                 f"Max pending pairing requests ({self._max_pending}) "
                 f"for channel {channel_id}"
@@ -161,13 +228,14 @@ class PairingManager:
         while code in self._pending:
             code = self.generate_code()
 
-        request = PairingRequest(
+        request = PairingRequest.create(
             code=code,
             sender_id=sender_id,
             sender_name=sender_name,
             channel_id=channel_id,
+            ttl=self._code_ttl,
         )
-        self._pending[code] = request
+        self._add_request(request)
         logger.info(f"Pairing request created for {sender_name} ({sender_id})")
         return request
 
@@ -180,18 +248,19 @@ class PairingManager:
           - Removes the pending request
           - Saves allowlist to disk
         """
-        code = code.upper().strip()
+        code = _canon_code(code)
         request = self._pending.get(code)
         if request is None:
             return None
         if request.is_expired():
-            del self._pending[code]
+            self._drop_request(code)
             return None
 
         # Approve!
         self._allowlist.add(request.sender_id)
-        del self._pending[code]
-        self._save_allowlist()
+        self._rebuild_fast_allow()
+        self._drop_request(code)
+        self._schedule_save()
         logger.info(
             f"Pairing approved: {request.sender_name} ({request.sender_id})"
         )
@@ -199,8 +268,8 @@ class PairingManager:
 
     def deny_code(self, code: str) -> Optional[PairingRequest]:
         """Deny a pairing code and optionally block the sender."""
-        code = code.upper().strip()
-        request = self._pending.pop(code, None)
+        code = _canon_code(code)
+        request = self._drop_request(code)
         if request:
             logger.info(
                 f"Pairing denied: {request.sender_name} ({request.sender_id})"
@@ -211,7 +280,8 @@ class PairingManager:
         """Remove a user from the allowlist."""
         if user_id in self._allowlist:
             self._allowlist.discard(user_id)
-            self._save_allowlist()
+            self._rebuild_fast_allow()
+            self._schedule_save()
             logger.info(f"Access revoked for user {user_id}")
             return True
         return False
@@ -220,6 +290,7 @@ class PairingManager:
         """Block a user from pairing."""
         self._blocklist.add(user_id)
         self.revoke(user_id)  # Also remove from allowlist
+        self._schedule_save()  # Persist the blocklist even if user wasn't allowed
         logger.info(f"User {user_id} blocked")
 
     # ─── Query ───
@@ -227,7 +298,7 @@ class PairingManager:
     def list_pending(self) -> List[PairingRequest]:
         """List non-expired pending requests."""
         self._cleanup_expired()
-        return [r for r in self._pending.values() if not r.is_expired()]
+        return list(self._pending.values())
 
     def list_allowed(self) -> Set[str]:
         """List all allowed user IDs."""
@@ -242,43 +313,113 @@ class PairingManager:
     def _allowlist_path(self) -> Path:
         return self._data_dir / "discord-allowFrom.json"
 
-    def _load_allowlist(self):
-        """Load allowlist from disk."""
+    async def load(self):
+        """Load the persisted allowlist (file read and parse run off the event loop)."""
+        data = await asyncio.to_thread(self._read_allowlist)
+        if data is None:
+            return
+        self._allowlist = set(data.get("allowed", []))
+        self._blocklist = set(data.get("blocked", []))
+        self._rebuild_fast_allow()
+        logger.info(
+            f"Loaded {len(self._allowlist)} allowed, "
+            f"{len(self._blocklist)} blocked users"
+        )
+
+    def _read_allowlist(self) -> Optional[dict]:
+        """Read and parse the allowlist file; None if missing or unreadable."""
         path = self._allowlist_path()
-        if path.exists():
-            try:
-                data = json.loads(path.read_text())
-                self._allowlist = set(data.get("allowed", []))
-                self._blocklist = set(data.get("blocked", []))
-                logger.info(
-                    f"Loaded {len(self._allowlist)} allowed, "
-                    f"{len(self._blocklist)} blocked users"
-                )
-            except Exception as e:
-                logger.error(f"Failed to load allowlist: {e}")
-
-    def _save_allowlist(self):
-        """Save allowlist to disk."""
+        if not path.exists():
+            return None
+        try:
+            raw = path.read_bytes()
+            return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+        except Exception as e:
+            logger.error(f"Failed to load allowlist: {e}")
+            return None
+
+    def _schedule_save(self):
+        """Mark the allowlist dirty and coalesce saves into one background write."""
+        self._save_dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return  # Pending save will pick up this change
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, tests): save synchronously
+            self._save_dirty = False
+            self._write_allowlist(set(self._allowlist), set(self._blocklist))
+            return
+        self._save_task = loop.create_task(self._save_loop())
+
+    async def _save_loop(self):
+        """Write the allowlist off the event loop until no changes remain."""
+        while self._save_dirty:
+            await asyncio.sleep(_SAVE_DELAY_SECONDS)
+            self._save_dirty = False
+            # Snapshot on the loop; the worker thread never sees the live sets
+            allowed, blocked = set(self._allowlist), set(self._blocklist)
+            await asyncio.to_thread(self._write_allowlist, allowed, blocked)
+
+    async def flush(self):
+        """Wait for any scheduled allowlist save to finish (call before shutdown)."""
+        task = self._save_task
+        if task is not None and not task.done():
+            await task
+
+    def _write_allowlist(self, allowed: Set[str], blocked: Set[str]):
+        """Save an allowlist snapshot to disk atomically (tmp file + replace)."""
         path = self._allowlist_path()
         try:
             self._data_dir.mkdir(parents=True, exist_ok=True)
             data = {
-                "allowed": sorted(self._allowlist),
-                "blocked": sorted(self._blocklist),
+                "allowed": sorted(allowed),
+                "blocked": sorted(blocked),
             }
-            path.write_text(json.dumps(data, indent=2))
+            tmp = path.with_name(path.name + ".tmp")
+            if HAS_ORJSON:
+                tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                tmp.write_text(json.dumps(data, indent=2))
+            os.replace(tmp, path)
         except Exception as e:
             logger.error(f"Failed to save allowlist: {e}")
 
+    def _add_request(self, request: PairingRequest):
+        """Insert a pending request into _pending and its reverse indexes."""
+        self._pending[request.code] = request
+        self._pending_by_sender[request.sender_id] = request.code
+        self._pending_by_channel.setdefault(request.channel_id, set()).add(request.code)
+        heapq.heappush(self._expiry_heap, (request.expires_at, request.code))
+
+    def _drop_request(self, code: str) -> Optional[PairingRequest]:
+        """Remove a pending request from _pending and its reverse indexes."""
+        request = self._pending.pop(code, None)
+        if request is None:
+            return None
+        if self._pending_by_sender.get(request.sender_id) == code:
+            del self._pending_by_sender[request.sender_id]
+        codes = self._pending_by_channel.get(request.channel_id)
+        if codes is not None:
+            codes.discard(code)
+            if not codes:
+                del self._pending_by_channel[request.channel_id]
+        return request
+
     def _cleanup_expired(self):
-        """Remove expired pending requests."""
-        expired = [
-            code for code, req in self._pending.items() if req.is_expired()
-        ]
-        for code in expired:
-            del self._pending[code]
+        """Remove expired pending requests (pops only due entries off the expiry heap)."""
+        heap = self._expiry_heap
+        now = time.time()
+        expired = 0
+        while heap and heap[0][0] <= now:
+            expires_at, code = heapq.heappop(heap)
+            request = self._pending.get(code)
+            # Approved/denied codes (or a reused code with a new expiry) leave stale entries
+            if request is not None and request.expires_at == expires_at:
+                self._drop_request(code)
+                expired += 1
         if expired:
-            logger.debug(f"Cleaned up {len(expired)} expired pairing requests")
+            logger.debug(f"Cleaned up {expired} expired pairing requests")
 
     # ─── Summary ───
 
@@ -17,7 +17,9 @@ Respects Discord's constraints:
 from __future__ import annotations
 import asyncio
 import logging
+import re
 import time
+import weakref
 from typing import Any, List, Optional
 
 logger = logging.getLogger("agent-zero.plugins.discord.streaming")
@@ -26,6 +28,12 @@ logger = logging.getLogger("agent-zero.plugins.discord.streaming")
 MAX_MESSAGE_LENGTH = 2000
 EDIT_THROTTLE_SECONDS = 0.5
 TYPING_INDICATOR = "▍"
+# Max in-flight sends/edits per channel across all streaming replies
+CHANNEL_REST_CONCURRENCY = 2
+
+# Sentence end (". ", "!\n", ...) written backwards: searching the reversed
+# window finds the rightmost one in a single scan
+_REVERSED_SENTENCE_END_RE = re.compile(r"[ \n][.!?]")
 
 
 class DiscordStreamingReply:
@@ -43,6 +51,12 @@ class DiscordStreamingReply:
       - Better for long responses that would exceed 2000 chars
     """
 
+    # channel id -> semaphore shared by every live reply in that channel;
+    # entries vanish once no reply holds them
+    _channel_sems: "weakref.WeakValueDictionary[int, asyncio.Semaphore]" = (
+        weakref.WeakValueDictionary()
+    )
+
     def __init__(
         self,
         channel,          # discord.TextChannel or Thread
@@ -56,12 +70,26 @@ class DiscordStreamingReply:
         self._min_chunk = min_chunk_chars
         self._max_chunk = max_chunk_chars
         self._break_pref = break_preference
+        # Concurrent replies in one channel (e.g. parallel threads) share this,
+        # bounding REST calls; waiters are woken FIFO, so calls stay ordered
+        sem = self._channel_sems.get(channel.id)
+        if sem is None:
+            sem = asyncio.Semaphore(CHANNEL_REST_CONCURRENCY)
+            self._channel_sems[channel.id] = sem
+        self._rest_sem = sem
 
         # State
         self._message = None       # The Discord message being edited
-        self._buffer: str = ""     # Accumulated text
-        self._sent_length: int = 0 # How much of buffer has been sent/edited
-        self._last_edit: float = 0
+        # Text is kept as fragments and only joined when a send/edit needs it,
+        # so each append is O(1) instead of copying the whole buffer
+        self._committed: List[str] = []  # Block-mode chunks already sent
+        self._unsent: List[str] = []     # Fragments not yet sent as a block
+        self._unsent_len: int = 0
+        self._content: Optional[str] = None  # Full text, cached on finish()
+        self._last_edit_mono: float = float("-inf")  # time.monotonic() of last edit
+        self._last_sent_display: str = ""  # Content of the last partial edit
+        self._pending_edit: Optional[asyncio.TimerHandle] = None  # Trailing edit
+        self._edit_task: Optional[asyncio.Task] = None  # Trailing edit in flight
         self._finished: bool = False
         self._messages_sent: List[Any] = []  # All messages sent (for block mode)
 
@@ -80,7 +108,7 @@ class DiscordStreamingReply:
 
         if self._mode == "partial":
             try:
-                self._message = await self._channel.send(TYPING_INDICATOR)
+                self._message = await self._send(TYPING_INDICATOR)
                 self._messages_sent.append(self._message)
             except Exception as e:
                 logger.error(f"Failed to send initial streaming message: {e}")
@@ -96,7 +124,8 @@ class DiscordStreamingReply:
         if self._mode == "off" or self._finished:
             return
 
-        self._buffer += text
+        self._unsent.append(text)
+        self._unsent_len += len(text)
 
         if self._mode == "partial":
             await self._update_partial()
@@ -111,56 +140,89 @@ class DiscordStreamingReply:
         In block mode: sends any remaining buffered text.
         """
         self._finished = True
-
-        if self._mode == "partial" and self._message and self._buffer:
+        if self._pending_edit is not None:
+            self._pending_edit.cancel()  # The final edit below supersedes it
+            self._pending_edit = None
+        if self._edit_task is not None:
+            # Let an in-flight trailing edit settle so it can't land after
+            # the final edit (it bails out once it sees _finished)
+            try:
+                await self._edit_task
+            except Exception:
+                pass
+            self._edit_task = None
+        buffer = self.content
+        self._content = buffer
+
+        if self._mode == "partial" and self._message and buffer:
             # Final edit with clean text (no indicator)
-            display = self._truncate(self._buffer)
+            display = self._truncate(buffer)
             try:
-                await self._message.edit(content=display)
+                await self._edit(display)
             except Exception as e:
                 logger.debug(f"Final stream edit failed: {e}")
                 # Send overflow if truncated
-                if len(self._buffer) > MAX_MESSAGE_LENGTH:
-                    await self._send_overflow(self._buffer[MAX_MESSAGE_LENGTH:])
+                if len(buffer) > MAX_MESSAGE_LENGTH:
+                    await self._send_overflow(buffer[MAX_MESSAGE_LENGTH:])
 
-        elif self._mode == "block" and self._buffer[self._sent_length:]:
+        elif self._mode == "block" and self._unsent_len:
             # Send remaining buffer
-            remaining = self._buffer[self._sent_length:]
+            remaining = self._unsent_text()
             if remaining.strip():
                 try:
-                    msg = await self._channel.send(remaining[:MAX_MESSAGE_LENGTH])
+                    msg = await self._send(remaining[:MAX_MESSAGE_LENGTH])
                     self._messages_sent.append(msg)
                 except Exception as e:
                     logger.debug(f"Final block send failed: {e}")
 
-        return self._buffer
+        return buffer
 
     # ─── Internal: partial mode ───
 
     async def _update_partial(self):
         """Edit the streaming message with current buffer."""
-        now = time.time()
-        if now - self._last_edit < EDIT_THROTTLE_SECONDS:
-            return  # Rate limited
-
         if not self._message:
             return
 
-        display = self._truncate(self._buffer + TYPING_INDICATOR)
+        now = time.monotonic()
+        wait = EDIT_THROTTLE_SECONDS - (now - self._last_edit_mono)
+        if wait > 0:
+            # Rate limited: schedule one trailing edit so the latest tokens
+            # still show if the stream pauses before the next append
+            if self._pending_edit is None:
+                self._pending_edit = asyncio.get_running_loop().call_later(
+                    wait, self._fire_pending_edit
+                )
+            return
+
+        display = self._truncate(self._unsent_text() + TYPING_INDICATOR)
+        if display == self._last_sent_display:
+            return  # Nothing new to show
+        # Claim the throttle window before awaiting so a concurrent
+        # trailing edit can't double up
+        self._last_edit_mono = now
         try:
-            await self._message.edit(content=display)
-            self._last_edit = now
+            async with self._rest_sem:
+                if self._finished:
+                    return  # finish() owns the final edit
+                await self._message.edit(content=display)
+            self._last_sent_display = display
         except Exception as e:
             logger.debug(f"Stream edit throttled or failed: {e}")
 
+    def _fire_pending_edit(self):
+        """Timer callback: run the trailing partial edit."""
+        self._pending_edit = None
+        if not self._finished:
+            self._edit_task = asyncio.ensure_future(self._update_partial())
+
     # ─── Internal: block mode ───
 
     async def _flush_blocks(self):
         """Send complete chunks in block mode."""
-        unsent = self._buffer[self._sent_length:]
-
-        if len(unsent) < self._min_chunk:
+        if self._unsent_len < self._min_chunk:
             return  # Not enough to send
+        unsent = self._unsent_text()
 
         # Find a good break point
         break_pos = self._find_break(unsent)
@@ -175,25 +237,31 @@ class DiscordStreamingReply:
             return
 
         try:
-            msg = await self._channel.send(chunk[:MAX_MESSAGE_LENGTH])
+            msg = await self._send(chunk[:MAX_MESSAGE_LENGTH])
             self._messages_sent.append(msg)
-            self._sent_length += break_pos
+            self._committed.append(chunk)
+            tail = unsent[break_pos:]
+            self._unsent = [tail] if tail else []
+            self._unsent_len = len(tail)
         except Exception as e:
             logger.debug(f"Block send failed: {e}")
 
     def _find_break(self, text: str) -> Optional[int]:
-        """Find good break point based on preference."""
+        """Find good break point based on preference (all within max_chunk)."""
+        max_chunk = self._max_chunk
         if self._break_pref == "paragraph":
             # Look for double newline
-            idx = text.find("\n\n")
+            idx = text.find("\n\n", 0, max_chunk)
             if idx > 0:
                 return idx + 2
         if self._break_pref in ("paragraph", "sentence"):
-            # Look for sentence end
-            for end in (". ", "! ", "? ", ".\n", "!\n", "?\n"):
-                idx = text.rfind(end, 0, self._max_chunk)
-                if idx > 0:
-                    return idx + len(end)
+            # Look for the last sentence end
+            window = text[:max_chunk]
+            m = _REVERSED_SENTENCE_END_RE.search(window[::-1])
+            if m:
+                end = len(window) - m.start()  # Just past the terminator's space/newline
+                if end > 2:
+                    return end
         if self._break_pref in ("paragraph", "sentence", "word"):
             # Look for word break
             idx = text.rfind(" ", 0, self._max_chunk)
@@ -203,23 +271,47 @@ class DiscordStreamingReply:
 
     # ─── Helpers ───
 
+    async def _send(self, content: str):
+        """Send a new message to the channel under the channel's REST bound."""
+        async with self._rest_sem:
+            return await self._channel.send(content)
+
+    async def _edit(self, content: str):
+        """Edit the streaming message under the channel's REST bound."""
+        async with self._rest_sem:
+            await self._message.edit(content=content)
+
+    def _unsent_text(self) -> str:
+        """Join the unsent fragments, keeping the result as the single fragment."""
+        unsent = self._unsent
+        if len(unsent) > 1:
+            self._unsent = unsent = ["".join(unsent)]
+        return unsent[0] if unsent else ""
+
     def _truncate(self, text: str) -> str:
         """Truncate text to Discord's message limit."""
         if len(text) <= MAX_MESSAGE_LENGTH:
             return text
         return text[:MAX_MESSAGE_LENGTH - 3] + "..."
 
+    @staticmethod
+    def _prepare_chunks(text: str) -> List[str]:
+        """Slice text into message-sized chunks (one slice each, no tail re-copying)."""
+        return [
+            text[i:i + MAX_MESSAGE_LENGTH]
+            for i in range(0, len(text), MAX_MESSAGE_LENGTH)
+        ]
+
     async def _send_overflow(self, text: str):
         """Send overflow text as additional messages."""
-        while text:
-            chunk = text[:MAX_MESSAGE_LENGTH]
-            text = text[MAX_MESSAGE_LENGTH:]
+        for chunk in self._prepare_chunks(text):
             try:
-                msg = await self._channel.send(chunk)
+                msg = await self._send(chunk)
                 self._messages_sent.append(msg)
             except Exception as e:
                 logger.error(f"Overflow send failed: {e}")
                 break
+            await asyncio.sleep(0)  # Let other handlers run between sends
 
     @property
     def message_count(self) -> int:
@@ -227,4 +319,6 @@ class DiscordStreamingReply:
 
     @property
     def content(self) -> str:
-        return self._buffer
+        if self._content is not None:
+            return self._content
+        return "".join(self._committed) + self._unsent_text()
@@ -13,18 +13,32 @@ Bindings auto-expire after a configurable TTL (default 24h).
 
 from __future__ import annotations
 import asyncio
+import heapq
+import inspect
+import itertools
 import logging
+import operator
 import time
 from dataclasses import dataclass, field
-from typing import Any, Callable, Coroutine, Dict, List, Optional
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
 
 logger = logging.getLogger("agent-zero.plugins.discord.threads")
 
+# Clock functions bound once: touch() runs on every routed message
+_wall = time.time
+_mono = time.monotonic
 
-@dataclass
+# Fields read by ThreadBinding._to_dict_at, fetched in one C-level call
+_DICT_FIELDS = operator.attrgetter(
+    "thread_id", "target", "user_id", "guild_id",
+    "created_at", "last_active", "message_count", "mono_last_active",
+)
+
+
+@dataclass(slots=True)
 class ThreadBinding:
     """A single thread → target binding."""
-    thread_id: str
+    thread_id: int         # Raw Discord channel ID of the thread
     target: str            # Sub-agent ID or model name
     user_id: str           # Who created the binding
     guild_id: Optional[str] = None
@@ -32,31 +46,48 @@ class ThreadBinding:
     last_active: float = field(default_factory=time.time)
     message_count: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # time.monotonic() of last activity: all TTL/idle math uses this, so wall-clock
+    # steps (NTP, manual changes) can't expire or pin bindings; the wall-clock
+    # created_at/last_active are kept for display
+    mono_last_active: float = field(default_factory=time.monotonic)
 
     def touch(self):
         """Update last activity timestamp."""
-        self.last_active = time.time()
+        self.last_active = _wall()
+        self.mono_last_active = _mono()
         self.message_count += 1
 
-    def is_expired(self, ttl_hours: float) -> bool:
-        """Check if this binding has expired based on TTL."""
+    def idle_seconds(self, mono_now: Optional[float] = None) -> float:
+        """Seconds since last activity (`mono_now` is a time.monotonic() sample)."""
+        if mono_now is None:
+            mono_now = _mono()
+        return mono_now - self.mono_last_active
+
+    def is_expired(self, ttl_hours: float, mono_now: Optional[float] = None) -> bool:
+        """Check if this binding has expired based on TTL (`mono_now` lets sweeps sample the clock once)."""
         if ttl_hours <= 0:
             return False  # 0 = never expire
-        elapsed_hours = (time.time() - self.last_active) / 3600
+        elapsed_hours = self.idle_seconds(mono_now) / 3600
         return elapsed_hours >= ttl_hours
 
     def to_dict(self) -> dict:
         """Serialize for display/storage."""
+        return self._to_dict_at(_wall(), _mono())
+
+    def _to_dict_at(self, now: float, mono_now: float) -> dict:
+        """Serialize against pre-sampled wall-clock and monotonic times."""
+        (thread_id, target, user_id, guild_id,
+         created_at, last_active, message_count, mono_last_active) = _DICT_FIELDS(self)
         return {
-            "thread_id": self.thread_id,
-            "target": self.target,
-            "user_id": self.user_id,
-            "guild_id": self.guild_id,
-            "created_at": self.created_at,
-            "last_active": self.last_active,
-            "message_count": self.message_count,
-            "age_hours": round((time.time() - self.created_at) / 3600, 1),
-            "idle_hours": round((time.time() - self.last_active) / 3600, 1),
+            "thread_id": str(thread_id),  # Snowflakes as strings for JSON/display
+            "target": target,
+            "user_id": user_id,
+            "guild_id": guild_id,
+            "created_at": created_at,
+            "last_active": last_active,
+            "message_count": message_count,
+            "age_hours": round((now - created_at) / 3600, 1),
+            "idle_hours": round((mono_now - mono_last_active) / 3600, 1),
         }
 
 
@@ -73,16 +104,39 @@ class ThreadBindingManager:
     """
 
     def __init__(self, ttl_hours: float = 24.0, cleanup_interval: float = 300.0):
-        self._bindings: Dict[str, ThreadBinding] = {}  # thread_id -> binding
+        self._bindings: Dict[int, ThreadBinding] = {}  # thread_id -> binding
+        # Min-heap of (mono_last_active, seq, thread_id, binding), one live entry per
+        # binding. touch() doesn't push: a popped entry whose binding was touched
+        # since is re-pushed at its new mono_last_active; entries whose binding was
+        # replaced or removed are dropped
+        self._expiry_heap: List[Tuple[float, int, int, ThreadBinding]] = []
+        self._heap_seq = itertools.count()  # Tie-breaker so bindings never compare
+        # Reverse indexes (value -> {thread_id: None}), kept in step with _bindings
+        # by _index_add/_index_remove; empty entries are removed. Dicts rather than
+        # sets so each index lists threads in the same order as _bindings
+        self._by_target: Dict[str, Dict[int, None]] = {}
+        self._by_guild: Dict[str, Dict[int, None]] = {}
+        self._by_user: Dict[str, Dict[int, None]] = {}
+        # One-slot cache of the last thread routed by get_and_touch (busy threads
+        # send runs of messages); cleared whenever that thread's binding changes
+        self._last_tid: Optional[int] = None
+        self._last_binding: Optional[ThreadBinding] = None
         self._ttl_hours = ttl_hours
+        self._ttl_seconds = ttl_hours * 3600.0  # Kept in step by the ttl_hours setter
         self._cleanup_interval = cleanup_interval
         self._cleanup_task: Optional[asyncio.Task] = None
+        # Event callbacks run one at a time on a single worker task instead
+        # of a fire-and-forget task per event
+        self._cb_queue: asyncio.Queue = asyncio.Queue()
+        self._cb_worker: Optional[asyncio.Task] = None
 
         # Callbacks for events
-        self._on_bind: Optional[Callable] = None
-        self._on_unbind: Optional[Callable] = None
-        self._on_expire: Optional[Callable] = None
-        self._on_create_thread: Optional[Callable] = None
+        # Callbacks for events, stored as (callback, is_coroutine_function)
+        # so the async check happens once at registration
+        self._on_bind: Optional[Tuple[Callable, bool]] = None
+        self._on_unbind: Optional[Tuple[Callable, bool]] = None
+        self._on_expire: Optional[Tuple[Callable, bool]] = None
+        self._on_create_thread: Optional[Tuple[Callable, bool]] = None
 
     @property
     def ttl_hours(self) -> float:
@@ -91,12 +145,13 @@ class ThreadBindingManager:
     @ttl_hours.setter
     def ttl_hours(self, value: float):
         self._ttl_hours = max(0, value)
+        self._ttl_seconds = self._ttl_hours * 3600.0
 
     # ─── Binding operations ───
 
     def bind(
         self,
-        thread_id: str,
+        thread_id: int,
         target: str,
         user_id: str,
         guild_id: Optional[str] = None,
@@ -108,12 +163,6 @@ class ThreadBindingManager:
         If the thread is already bound, the binding is updated.
         Returns the new or updated binding.
         """
-        existing = self._bindings.get(thread_id)
-        if existing:
-            logger.info(
-                f"Rebinding thread {thread_id}: {existing.target} → {target}"
-            )
-
         binding = ThreadBinding(
             thread_id=thread_id,
             target=target,
@@ -121,36 +170,67 @@ class ThreadBindingManager:
             guild_id=guild_id,
             metadata=metadata or {},
         )
-        self._bindings[thread_id] = binding
+        # One probe for a fresh bind; only a rebind needs the second store
+        existing = self._bindings.setdefault(thread_id, binding)
+        if existing is not binding:
+            self._forget_cached(thread_id)
+            logger.info(
+                f"Rebinding thread {thread_id}: {existing.target} → {target}"
+            )
+            self._index_remove(existing)
+            # Re-insert at the end, as the index entries are, so orders agree
+            del self._bindings[thread_id]
+            self._bindings[thread_id] = binding
+        self._index_add(binding)
+        self._schedule_expiry(binding)
         logger.info(f"Thread {thread_id} bound to '{target}' by user {user_id}")
 
         if self._on_bind:
-            asyncio.ensure_future(self._safe_callback(self._on_bind, binding))
+            self._emit(self._on_bind, binding)
 
         return binding
 
-    def unbind(self, thread_id: str) -> Optional[ThreadBinding]:
+    def unbind(self, thread_id: int) -> Optional[ThreadBinding]:
         """
         Remove a thread binding. Returns the removed binding (if any).
         """
         binding = self._bindings.pop(thread_id, None)
         if binding:
+            self._forget_cached(thread_id)
+            self._index_remove(binding)
             logger.info(
                 f"Thread {thread_id} unbound from '{binding.target}' "
                 f"(had {binding.message_count} messages)"
             )
             if self._on_unbind:
-                asyncio.ensure_future(self._safe_callback(self._on_unbind, binding))
+                self._emit(self._on_unbind, binding)
         return binding
 
-    def get_binding(self, thread_id: str) -> Optional[ThreadBinding]:
+    def get_binding(self, thread_id: int) -> Optional[ThreadBinding]:
         """
         Get the binding for a thread, or None if not bound.
         Does NOT touch (update activity) — call touch() explicitly.
         """
         return self._bindings.get(thread_id)
 
-    def touch(self, thread_id: str) -> bool:
+    def get_and_touch(self, thread_id: int) -> Optional[ThreadBinding]:
+        """
+        Get the binding for a thread and record activity on it, in one lookup.
+        This is the per-message routing call; returns None if not bound.
+        """
+        if thread_id == self._last_tid:
+            binding = self._last_binding
+        else:
+            binding = self._bindings.get(thread_id)
+            if binding is not None:
+                self._last_tid, self._last_binding = thread_id, binding
+        if binding is not None:
+            binding.last_active = _wall()
+            binding.mono_last_active = _mono()
+            binding.message_count += 1
+        return binding
+
+    def touch(self, thread_id: int) -> bool:
         """
         Update activity timestamp for a thread binding.
         Returns True if binding exists and was touched.
@@ -161,7 +241,7 @@ class ThreadBindingManager:
             return True
         return False
 
-    def is_bound(self, thread_id: str) -> bool:
+    def is_bound(self, thread_id: int) -> bool:
         """Check if a thread is currently bound."""
         return thread_id in self._bindings
 
@@ -171,24 +251,61 @@ class ThreadBindingManager:
         self, guild_id: Optional[str] = None, user_id: Optional[str] = None
     ) -> List[ThreadBinding]:
         """List active bindings, optionally filtered by guild or user."""
-        bindings = list(self._bindings.values())
-        if guild_id:
-            bindings = [b for b in bindings if b.guild_id == guild_id]
-        if user_id:
-            bindings = [b for b in bindings if b.user_id == user_id]
-        return bindings
+        if not guild_id and not user_id:
+            return list(self._bindings.values())
+        if guild_id and user_id:
+            user_ids = self._by_user.get(user_id, {})
+            ids = [tid for tid in self._by_guild.get(guild_id, ()) if tid in user_ids]
+        elif guild_id:
+            ids = self._by_guild.get(guild_id, ())
+        else:
+            ids = self._by_user.get(user_id, ())
+        return [self._bindings[tid] for tid in ids]
 
     def count(self) -> int:
         """Number of active bindings."""
         return len(self._bindings)
 
+    def to_dict_list(self) -> List[dict]:
+        """Serialize all bindings, sampling the clocks once for the whole batch."""
+        now, mono_now = _wall(), _mono()
+        return [b._to_dict_at(now, mono_now) for b in self._bindings.values()]
+
     def get_bindings_for_target(self, target: str) -> List[ThreadBinding]:
         """Find all thread bindings pointing to a specific target."""
-        return [b for b in self._bindings.values() if b.target == target]
+        return [self._bindings[tid] for tid in self._by_target.get(target, ())]
 
     def get_targets(self) -> List[str]:
         """List all unique targets that have bindings."""
-        return list(set(b.target for b in self._bindings.values()))
+        return list(self._by_target)
+
+    def _forget_cached(self, thread_id: int):
+        """Drop the get_and_touch cache slot if it holds `thread_id`."""
+        if thread_id == self._last_tid:
+            self._last_tid = self._last_binding = None
+
+    def _index_add(self, binding: ThreadBinding):
+        """Register a binding in the target/guild/user reverse indexes."""
+        tid = binding.thread_id
+        self._by_target.setdefault(binding.target, {})[tid] = None
+        if binding.guild_id:
+            self._by_guild.setdefault(binding.guild_id, {})[tid] = None
+        if binding.user_id:
+            self._by_user.setdefault(binding.user_id, {})[tid] = None
+
+    def _index_remove(self, binding: ThreadBinding):
+        """Drop a binding from the reverse indexes."""
+        tid = binding.thread_id
+        for index, key in (
+            (self._by_target, binding.target),
+            (self._by_guild, binding.guild_id),
+            (self._by_user, binding.user_id),
+        ):
+            ids = index.get(key)
+            if ids is not None:
+                ids.pop(tid, None)
+                if not ids:
+                    del index[key]
 
     # ─── TTL cleanup ───
 
@@ -198,13 +315,20 @@ class ThreadBindingManager:
             return  # Already running
 
         self._cleanup_task = asyncio.ensure_future(self._cleanup_loop())
+        self._ensure_callback_worker()  # Drain events queued before the loop ran
         logger.info(
             f"Thread binding cleanup started "
             f"(TTL: {self._ttl_hours}h, interval: {self._cleanup_interval}s)"
         )
 
     async def stop_cleanup_loop(self):
-        """Stop the background cleanup loop."""
+        """Stop the background cleanup loop (and the callback worker)."""
+        if self._cb_worker and not self._cb_worker.done():
+            self._cb_worker.cancel()
+            try:
+                await self._cb_worker
+            except asyncio.CancelledError:
+                pass
         if self._cleanup_task and not self._cleanup_task.done():
             self._cleanup_task.cancel()
             try:
@@ -232,27 +356,55 @@ class ThreadBindingManager:
         Remove all bindings that have exceeded their TTL.
         Returns list of expired bindings.
         """
-        if self._ttl_hours <= 0:
+        ttl_seconds = self._ttl_seconds
+        if ttl_seconds <= 0:
             return []  # TTL disabled
 
+        # Only entries idle since before the cutoff are popped; the rest of
+        # the heap (and of the bindings) is never visited
+        now = _mono()
+        heap = self._expiry_heap
+        heappop = heapq.heappop
+        get_binding = self._bindings.get
+        pop_binding = self._bindings.pop
+        log = logger.info
         expired = []
-        for thread_id in list(self._bindings.keys()):
-            binding = self._bindings[thread_id]
-            if binding.is_expired(self._ttl_hours):
-                self._bindings.pop(thread_id)
-                expired.append(binding)
-                logger.info(
-                    f"Thread {thread_id} binding expired "
-                    f"(target: '{binding.target}', idle: "
-                    f"{round((time.time() - binding.last_active) / 3600, 1)}h)"
-                )
-                if self._on_expire:
-                    asyncio.ensure_future(
-                        self._safe_callback(self._on_expire, binding)
-                    )
+        while heap and now - heap[0][0] >= ttl_seconds:
+            _, _, thread_id, binding = heappop(heap)
+            if get_binding(thread_id) is not binding:
+                continue  # Unbound or rebound since this entry was pushed
+            if now - binding.mono_last_active < ttl_seconds:
+                self._schedule_expiry(binding)  # Touched since: re-queue
+                continue
+            pop_binding(thread_id)
+            self._forget_cached(thread_id)
+            self._index_remove(binding)
+            expired.append(binding)
+            log(
+                f"Thread {thread_id} binding expired "
+                f"(target: '{binding.target}', idle: "
+                f"{round((now - binding.mono_last_active) / 3600, 1)}h)"
+            )
+            if self._on_expire:
+                self._emit(self._on_expire, binding)
 
         return expired
 
+    def _schedule_expiry(self, binding: ThreadBinding):
+        """Queue a binding on the expiry heap at its current mono_last_active."""
+        heap = self._expiry_heap
+        # Unbind/rebind leave dead entries; rebuild once they dominate the heap
+        if len(heap) > 2 * len(self._bindings) + 64:
+            heap[:] = [
+                (b.mono_last_active, next(self._heap_seq), tid, b)
+                for tid, b in self._bindings.items()
+                if b is not binding
+            ]
+            heapq.heapify(heap)
+        heapq.heappush(
+            heap, (binding.mono_last_active, next(self._heap_seq), binding.thread_id, binding)
+        )
+
     # ─── Auto-thread creation ───
 
     async def create_thread_for_subagent(
@@ -288,13 +440,14 @@ class ThreadBindingManager:
             )
 
             binding = self.bind(
-                thread_id=str(thread.id),
+                thread_id=thread.id,
                 target=target,
                 user_id=user_id,
                 guild_id=str(thread.guild.id) if thread.guild else None,
                 metadata={
-                    "parent_message_id": str(parent_message.id),
-                    "parent_channel_id": str(parent_message.channel.id),
+                    # Raw int snowflakes, like the thread_id key itself
+                    "parent_message_id": parent_message.id,
+                    "parent_channel_id": parent_message.channel.id,
                     "auto_created": True,
                 },
             )
@@ -312,9 +465,7 @@ class ThreadBindingManager:
             )
 
             if self._on_create_thread:
-                asyncio.ensure_future(
-                    self._safe_callback(self._on_create_thread, binding, thread)
-                )
+                self._emit(self._on_create_thread, binding, thread)
 
             return binding
 
@@ -326,26 +477,61 @@ class ThreadBindingManager:
 
     def on_bind(self, callback: Callable):
         """Register callback for bind events: callback(binding)."""
-        self._on_bind = callback
+        self._on_bind = self._callback_entry(callback)
 
     def on_unbind(self, callback: Callable):
         """Register callback for unbind events: callback(binding)."""
-        self._on_unbind = callback
+        self._on_unbind = self._callback_entry(callback)
 
     def on_expire(self, callback: Callable):
         """Register callback for expire events: callback(binding)."""
-        self._on_expire = callback
+        self._on_expire = self._callback_entry(callback)
 
     def on_create_thread(self, callback: Callable):
         """Register callback for thread creation: callback(binding, thread)."""
-        self._on_create_thread = callback
+        self._on_create_thread = self._callback_entry(callback)
+
+    @staticmethod
+    def _callback_entry(callback: Optional[Callable]) -> Optional[Tuple[Callable, bool]]:
+        """Pair a callback with whether it is a coroutine function (None clears it)."""
+        if callback is None:
+            return None
+        return callback, inspect.iscoroutinefunction(callback)
 
     # ─── Helpers ───
 
-    async def _safe_callback(self, callback, *args):
-        """Invoke a callback safely, catching any errors."""
+    def _emit(self, entry: Tuple[Callable, bool], *args):
+        """Queue an event callback entry for the worker task."""
+        self._cb_queue.put_nowait((entry, args))
+        self._ensure_callback_worker()
+
+    def _ensure_callback_worker(self):
+        """Start the callback worker if it isn't running (no-op outside a loop)."""
+        if self._cb_worker is not None and not self._cb_worker.done():
+            return
         try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Queued events run once start_cleanup_loop() starts the worker
+        self._cb_worker = loop.create_task(self._callback_worker())
+
+    async def _callback_worker(self):
+        """Run queued event callbacks in order."""
+        queue = self._cb_queue
+        while True:
+            entry, args = await queue.get()
+            await self._safe_callback(entry, *args)
+
+    async def _safe_callback(self, entry: Tuple[Callable, bool], *args):
+        """Invoke a callback entry safely, catching any errors."""
+        callback, is_async = entry
+        try:
+            if is_async:
+                await callback(*args)
+                return
             result = callback(*args)
+            # Plain callables may still hand back an awaitable (e.g. a lambda
+            # wrapping a coroutine call)
             if asyncio.iscoroutine(result):
                 await result
         except Exception as e:
@@ -356,11 +542,10 @@ class ThreadBindingManager:
         if not self._bindings:
             return "No active thread bindings"
 
-        lines = [f"**{self.count()} active binding(s):**"]
-        for b in self._bindings.values():
-            idle = round((time.time() - b.last_active) / 3600, 1)
-            lines.append(
-                f"  • Thread `{b.thread_id}` → `{b.target}` "
-                f"({b.message_count} msgs, idle {idle}h)"
-            )
-        return "\n".join(lines)
+        now = _mono()
+        body = "\n".join(
+            f"  • Thread `{b.thread_id}` → `{b.target}` "
+            f"({b.message_count} msgs, idle {(now - b.mono_last_active) / 3600:.1f}h)"
+            for b in self._bindings.values()
+        )
+        return f"**{len(self._bindings)} active binding(s):**\n{body}"
@@ -4,6 +4,7 @@ Email Channel Plugin for Agent Zero
 Connects Agent Zero to email via IMAP/SMTP.
 Polls IMAP for incoming emails and replies via SMTP.
 No external dependencies — uses Python's built-in imaplib + smtplib.
+Optional: aioimaplib enables IMAP IDLE push instead of polling.
 """
 
 from python.helpers.plugin_api import AgentZeroPluginApi
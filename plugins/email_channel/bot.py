@@ -6,14 +6,24 @@ and send replies. No external dependencies required.
 
 IMAP polling runs in an async loop, checking for unseen emails at a
 configurable interval. Replies are sent via SMTP with HTML formatting.
+
+If aioimaplib is installed (pip install aioimaplib), the inbox is watched
+with IMAP IDLE instead: the server pushes new-mail notifications and we
+only fetch on arrival. Servers without IDLE fall back to polling.
+
+If aiosmtplib is installed (pip install aiosmtplib), replies are sent from
+the event loop directly instead of through a thread.
 """
 
 from __future__ import annotations
 import os
 import asyncio
+import concurrent.futures
 import imaplib
 import re
 import smtplib
+import ssl
+import time
 import email
 import email.utils
 import html
@@ -21,12 +31,85 @@ import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import decode_header
-from typing import List, Optional
+from typing import List, Optional, Set
+
+try:
+    import aioimaplib
+    HAS_AIOIMAPLIB = True
+except ImportError:
+    HAS_AIOIMAPLIB = False
+
+try:
+    import aiosmtplib
+    HAS_AIOSMTPLIB = True
+except ImportError:
+    HAS_AIOSMTPLIB = False
 
 from python.helpers.plugin_api import ChannelAdapter, ChannelMessage
 
 logger = logging.getLogger("agent-zero.plugins.email")
 
+# Pulls the UID out of a FETCH response line, e.g. "n (UID x BODY[] {size}"
+_FETCH_UID_RE = re.compile(rb"UID (\d+)")
+
+# Markdown → HTML for _markdown_to_html. Block structure is decided per
+# line by _RE_BLOCK; inline markup is converted by one combined pattern.
+_RE_BLOCK = re.compile(
+    r'(?P<hashes>#{1,3}) (?P<heading>.+)'
+    r'|(?P<hr>---+)$'
+    r'|[\-\*] (?P<ul>.+)'
+    r'|\d+\. (?P<ol>.+)'
+)
+_RE_INLINE = re.compile(
+    r'\*\*\*(?P<both>.+?)\*\*\*'
+    r'|\*\*(?P<bold>.+?)\*\*'
+    r'|(?<!\*)\*(?!\*)(?P<em>.+?)(?<!\*)\*(?!\*)'
+    r'|\[(?P<text>[^\]]+)\]\((?P<link>[^)]+)\)'
+    r'|(?P<url>https?://[^\s<>"\)]+)'
+)
+# Same, minus bare URLs: used for link text so anchors never nest
+_RE_INLINE_TEXT = re.compile(_RE_INLINE.pattern.rsplit("|", 1)[0])
+
+_HEADING_OPEN = {
+    "#": '<h1 style="color:#1e40af;margin:24px 0 12px 0;">',
+    "##": '<h2 style="color:#1d4ed8;margin:20px 0 10px 0;">',
+    "###": '<h3 style="color:#2563eb;margin:16px 0 8px 0;">',
+}
+_LIST_OPEN = {
+    "ul": '<ul style="margin:8px 0;padding-left:24px;">',
+    "ol": '<ol style="margin:8px 0;padding-left:24px;">',
+}
+_HR_HTML = '<hr style="border:none;border-top:1px solid #e5e7eb;margin:16px 0;">'
+
+# Short replies with none of these markers are sent as plain text only
+_RE_HAS_MARKDOWN = re.compile(r'[*#\[]|https?://|^-\s|^\d+\.\s|^---', re.MULTILINE)
+_PLAIN_ONLY_MAX_CHARS = 512
+
+# Placeholders in email_template.html; splitting on them keeps each mark at
+# an odd index of the resulting list
+_TEMPLATE_MARK_RE = re.compile(r"({{CONTENT}}|{{SUBJECT}}|{{DATE}}|{{SENDER_EMAIL}})")
+
+
+def _inline_repl(match: re.Match) -> str:
+    """Render one inline markdown token matched by _RE_INLINE."""
+    kind = match.lastgroup
+    if kind == "both":
+        return f"<strong><em>{_inline_md(match.group('both'))}</em></strong>"
+    if kind == "bold":
+        return f"<strong>{_inline_md(match.group('bold'))}</strong>"
+    if kind == "em":
+        return f"<em>{_inline_md(match.group('em'))}</em>"
+    if kind == "link":
+        text = _RE_INLINE_TEXT.sub(_inline_repl, match.group("text"))
+        return f'<a href="{match.group("link")}" style="color:#2563eb;">{text}</a>'
+    url = match.group("url")
+    return f'<a href="{url}" style="color:#2563eb;">{url}</a>'
+
+
+def _inline_md(line: str) -> str:
+    """Convert bold, italic, links and bare URLs in one (escaped) line."""
+    return _RE_INLINE.sub(_inline_repl, line)
+
 
 def _decode_header_value(value: str) -> str:
     """Decode an email header value that may be encoded (RFC 2047)."""
@@ -77,6 +160,23 @@ class EmailChannelAdapter(ChannelAdapter):
     and replies via SMTP.
     """
 
+    # IMAP IDLE config (aioimaplib only). RFC 2177 servers may drop an
+    # IDLE after 30 minutes, so re-arm just under that.
+    IDLE_TIMEOUT_SECONDS = 29 * 60
+
+    # Reconnect config for the IDLE session (same backoff as Matrix)
+    RECONNECT_INITIAL_DELAY = 5.0
+    RECONNECT_MAX_DELAY = 300.0  # 5 minutes
+
+    # Recycle the pooled imaplib connection before the ~30 min idle cap
+    # that Gmail/iCloud enforce
+    IMAP_MAX_IDLE_SECONDS = 25 * 60
+
+    # Recycle the pooled SMTP session periodically so servers can release
+    # per-connection resources
+    SMTP_MAX_MESSAGES = 5000
+    SMTP_MAX_AGE_SECONDS = 30 * 60
+
     def __init__(
         self,
         imap_host: str = "",
@@ -110,9 +210,32 @@ class EmailChannelAdapter(ChannelAdapter):
         self._poll_task: Optional[asyncio.Task] = None
         self._should_poll = True
         self._imap: Optional[imaplib.IMAP4_SSL | imaplib.IMAP4] = None
+        self._imap_last_used = 0.0  # time.monotonic() of last successful use
+        # UIDs left unread on purpose (sender not allowed, unparseable), so
+        # they aren't downloaded again every cycle
+        self._skipped_uids: Set[bytes] = set()
+        self._template_parts: Optional[List[str]] = None
+        self._sender_email_html = html.escape(self.smtp_user or "")
+        # Pooled SMTP session; sends are serialized on it by _smtp_lock
+        self._smtp: Optional[smtplib.SMTP | smtplib.SMTP_SSL] = None
+        self._asmtp = None  # aiosmtplib.SMTP when HAS_AIOSMTPLIB
+        self._smtp_count = 0
+        self._smtp_opened = 0.0
+        self._smtp_lock = asyncio.Lock()
+        # One dedicated thread each for blocking IMAP and SMTP calls, so a slow
+        # poll never delays a reply and neither queues behind the default executor
+        self._imap_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._smtp_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # Loop the adapter was started on; it owns _smtp_lock and the
+        # aiosmtplib session
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def start(self):
         """Start the email polling loop."""
+        # Bind to this loop even if polling is not configured, so SMTP-only
+        # setups still serialize sends on one loop
+        self._loop = asyncio.get_running_loop()
+
         if not self.imap_host or not self.imap_user:
             logger.error("Email plugin: IMAP host and user are required")
             return
@@ -132,12 +255,22 @@ class EmailChannelAdapter(ChannelAdapter):
         # Default SMTP user to IMAP user if not set
         if not self.smtp_user:
             self.smtp_user = self.imap_user
+            self._sender_email_html = html.escape(self.smtp_user)
 
         logger.info(
             f"Starting email polling: {self.imap_user}@{self.imap_host}:{self.imap_port} "
             f"(every {self.poll_interval}s, TLS={'on' if self.use_tls else 'off'})"
         )
 
+        if self._imap_executor is None:
+            self._imap_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="email-imap"
+            )
+        if self._smtp_executor is None:
+            self._smtp_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="email-smtp"
+            )
+
         self._should_poll = True
         self._poll_task = asyncio.create_task(self._poll_loop())
 
@@ -159,10 +292,25 @@ class EmailChannelAdapter(ChannelAdapter):
                 pass
             self._imap = None
 
+        if self._smtp or self._asmtp:
+            async with self._smtp_lock:
+                await self._close_aiosmtp()
+                await asyncio.get_running_loop().run_in_executor(self._smtp_executor, self._close_smtp)
+
+        for executor in (self._imap_executor, self._smtp_executor):
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._imap_executor = self._smtp_executor = None
+
         logger.info("Email polling stopped")
 
     async def _poll_loop(self):
         """Main polling loop — runs in background, checks IMAP for unseen emails."""
+        if HAS_AIOIMAPLIB:
+            if await self._idle_loop():
+                return
+            logger.info("IMAP server does not support IDLE, falling back to polling")
+
         while self._should_poll:
             try:
                 await self._check_inbox()
@@ -183,6 +331,125 @@ class EmailChannelAdapter(ChannelAdapter):
             except asyncio.CancelledError:
                 break
 
+    async def _idle_loop(self) -> bool:
+        """
+        Push-driven inbox watcher using IMAP IDLE, with exponential backoff
+        on reconnect. Returns False if the server does not advertise IDLE
+        (caller falls back to polling), True once stopped.
+        """
+        delay = self.RECONNECT_INITIAL_DELAY
+        while self._should_poll:
+            client = None
+            try:
+                client = await self._connect_aioimap()
+                if not client.has_capability("IDLE"):
+                    return False
+                delay = self.RECONNECT_INITIAL_DELAY
+                await self._idle_session(client)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                if not self._should_poll:
+                    break
+                logger.warning(
+                    f"IMAP IDLE disconnected ({e}). "
+                    f"Reconnecting in {delay:.0f}s..."
+                )
+            finally:
+                if client is not None:
+                    await self._logout_aioimap(client)
+
+            if not self._should_poll:
+                break
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                break
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+        return True
+
+    async def _idle_session(self, client):
+        """Fetch whatever is unseen, then IDLE until the server reports new mail."""
+        while self._should_poll:
+            await self._dispatch_emails(await self._fetch_unseen_async(client))
+
+            idle = await client.idle_start(timeout=self.IDLE_TIMEOUT_SECONDS)
+            while client.has_pending_idle():
+                push = await client.wait_server_push(timeout=self.IDLE_TIMEOUT_SECONDS + 60)
+                if push == aioimaplib.STOP_WAIT_SERVER_PUSH:
+                    # IDLE timed out and was ended for us; re-arm
+                    break
+                if any(b"EXISTS" in line for line in push if isinstance(line, (bytes, bytearray))):
+                    break
+            if client.has_pending_idle():
+                client.idle_done()
+            await asyncio.wait_for(idle, timeout=30)
+
+    async def _connect_aioimap(self):
+        """Create, authenticate and select INBOX on an aioimaplib connection."""
+        if self.use_tls:
+            client = aioimaplib.IMAP4_SSL(host=self.imap_host, port=self.imap_port)
+        else:
+            client = aioimaplib.IMAP4(host=self.imap_host, port=self.imap_port)
+        await client.wait_hello_from_server()
+        response = await client.login(self.imap_user, self.imap_password)
+        if response.result != "OK":
+            raise ConnectionError(f"IMAP login failed: {response.lines}")
+        await client.select("INBOX")
+        return client
+
+    @staticmethod
+    async def _logout_aioimap(client):
+        """Best-effort logout of an aioimaplib connection."""
+        try:
+            await asyncio.wait_for(client.logout(), timeout=5)
+        except Exception:
+            pass
+
+    async def _fetch_unseen_async(self, client) -> list:
+        """Fetch unseen messages over an aioimaplib connection; mark accepted ones read."""
+        response = await client.uid_search("UNSEEN")
+        if response.result != "OK" or not response.lines:
+            return []
+        uids = self._new_unseen([u for u in response.lines[0].split() if u.isdigit()])
+        if not uids:
+            return []
+
+        # PEEK leaves \Seen untouched, so mail we skip stays unread
+        uid_set = b",".join(uids).decode()
+        response = await client.uid("fetch", uid_set, "(BODY.PEEK[])")
+        if response.result != "OK":
+            return []
+
+        # Literal message bodies arrive as bytearray lines, each preceded by
+        # the "n FETCH (UID x BODY[] {size}" line that names its UID
+        results = []
+        accepted = []
+        uid = None
+        for line in response.lines:
+            if isinstance(line, bytearray):
+                if uid is not None:
+                    try:
+                        msg_data = self._parse_email(uid, bytes(line))
+                    except Exception as e:
+                        logger.error(f"Error parsing email UID {uid}: {e}")
+                        msg_data = None
+                    if msg_data:
+                        results.append(msg_data)
+                        accepted.append(uid)
+                    else:
+                        self._skipped_uids.add(uid)
+                uid = None
+            elif isinstance(line, bytes):
+                match = _FETCH_UID_RE.search(line)
+                if match:
+                    uid = match.group(1)
+
+        if accepted:
+            await client.uid("store", b",".join(accepted).decode(), "+FLAGS", "(\\Seen)")
+        return results
+
     def _connect_imap(self) -> imaplib.IMAP4_SSL | imaplib.IMAP4:
         """Create and authenticate an IMAP connection."""
         if self.use_tls:
@@ -192,12 +459,38 @@ class EmailChannelAdapter(ChannelAdapter):
         conn.login(self.imap_user, self.imap_password)
         return conn
 
+    def _imap_healthy(self) -> bool:
+        """
+        Blocking: NOOP the pooled IMAP connection. Only protocol-fatal
+        errors (abort, TLS/socket failure) or exceeding the idle cap count
+        as unhealthy; other IMAP errors leave the connection in place.
+        """
+        if time.monotonic() - self._imap_last_used > self.IMAP_MAX_IDLE_SECONDS:
+            return False
+        try:
+            self._imap.noop()
+        except (imaplib.IMAP4.abort, ssl.SSLError, OSError):
+            return False
+        except imaplib.IMAP4.error:
+            pass
+        return True
+
+    def _close_imap(self):
+        """Blocking: log out of the pooled IMAP connection and drop it."""
+        try:
+            self._imap.logout()
+        except Exception:
+            pass
+        self._imap = None
+
     async def _check_inbox(self):
         """Check for unseen emails and dispatch them as ChannelMessages."""
         # Run blocking IMAP operations in a thread
-        loop = asyncio.get_event_loop()
-        messages = await loop.run_in_executor(None, self._fetch_unseen)
+        messages = await self._loop.run_in_executor(self._imap_executor, self._fetch_unseen)
+        await self._dispatch_emails(messages)
 
+    async def _dispatch_emails(self, messages: list):
+        """Frame parsed emails for the agent and dispatch them as ChannelMessages."""
         for msg_data in messages:
             sender_email = msg_data["from_email"]
             sender_name = msg_data["from_name"]
@@ -253,66 +546,101 @@ class EmailChannelAdapter(ChannelAdapter):
         results = []
 
         try:
-            # Reconnect if needed
+            # Reuse the pooled connection if it still answers, else reconnect
+            if self._imap is not None and not self._imap_healthy():
+                self._close_imap()
             if self._imap is None:
                 self._imap = self._connect_imap()
 
             self._imap.select("INBOX")
-            status, data = self._imap.search(None, "UNSEEN")
+            self._imap_last_used = time.monotonic()
+            status, data = self._imap.uid("SEARCH", None, "UNSEEN")
 
-            if status != "OK" or not data[0]:
+            if status != "OK":
                 return results
 
-            uids = data[0].split()
-            for uid in uids:
-                try:
-                    status, msg_data = self._imap.fetch(uid, "(RFC822)")
-                    if status != "OK":
-                        continue
-
-                    raw_email = msg_data[0][1]
-                    msg = email.message_from_bytes(raw_email)
-
-                    # Parse sender
-                    from_header = msg.get("From", "")
-                    from_name, from_email = email.utils.parseaddr(from_header)
-                    from_name = _decode_header_value(from_name)
-                    from_email = from_email.lower()
+            # One UID FETCH for the whole set (PEEK leaves \Seen untouched),
+            # then one UID STORE marking only the accepted messages as read;
+            # skipped senders and unparseable mail stay unread
+            uids = self._new_unseen(data[0].split() if data[0] else [])
+            if not uids:
+                return results
+            uid_set = b",".join(uids)
+            status, msg_data = self._imap.uid("FETCH", uid_set, "(BODY.PEEK[])")
+            if status != "OK":
+                return results
 
-                    # Check allowed senders
-                    if self.allowed_senders and from_email not in self.allowed_senders:
-                        logger.debug(f"Ignoring email from non-allowed sender: {from_email}")
+            accepted = []
+            for item in msg_data:
+                # Message literals come back as (b"n (UID x BODY[] {size}", raw)
+                if not isinstance(item, tuple):
+                    continue
+                match = _FETCH_UID_RE.search(item[0])
+                if not match:
+                    continue
+                uid = match.group(1)
+                try:
+                    parsed = self._parse_email(uid, item[1])
+                    if parsed is not None:
+                        results.append(parsed)
+                        accepted.append(uid)
                         continue
-
-                    # Parse subject and body
-                    subject = _decode_header_value(msg.get("Subject", ""))
-                    body = _extract_body(msg)
-                    message_id = msg.get("Message-ID", "")
-
-                    results.append({
-                        "uid": uid.decode() if isinstance(uid, bytes) else str(uid),
-                        "from_email": from_email,
-                        "from_name": from_name,
-                        "subject": subject,
-                        "body": body.strip(),
-                        "message_id": message_id,
-                    })
-
-                    # Mark as read
-                    self._imap.store(uid, "+FLAGS", "\\Seen")
-
                 except Exception as e:
                     logger.error(f"Error parsing email UID {uid}: {e}")
+                self._skipped_uids.add(uid)
+
+            if accepted:
+                self._imap.uid("STORE", b",".join(accepted), "+FLAGS", "(\\Seen)")
 
         except imaplib.IMAP4.abort:
             logger.warning("IMAP connection aborted, will reconnect next cycle")
             self._imap = None
         except Exception as e:
+            # Keep the connection; the next cycle's NOOP decides if it is dead
             logger.error(f"IMAP fetch error: {e}")
-            self._imap = None
 
         return results
 
+    def _new_unseen(self, uids: List[bytes]) -> List[bytes]:
+        """
+        Drop UIDs we already skipped from an UNSEEN search result. The skip
+        set is pruned to the current result, so mail read elsewhere leaves it.
+        """
+        skipped = self._skipped_uids
+        if skipped:
+            skipped.intersection_update(uids)
+            return [uid for uid in uids if uid not in skipped]
+        return uids
+
+    def _parse_email(self, uid, raw_email: bytes) -> Optional[dict]:
+        """Parse a raw RFC822 message; None if the sender is not allowed."""
+        msg = email.message_from_bytes(raw_email)
+
+        # Parse sender
+        from_header = msg.get("From", "")
+        from_name, from_email = email.utils.parseaddr(from_header)
+        from_name = _decode_header_value(from_name)
+        from_email = from_email.lower()
+
+        # Check allowed senders
+        if self.allowed_senders and from_email not in self.allowed_senders:
+            logger.debug(f"Ignoring email from non-allowed sender: {from_email}")
+            return None
+
+        # Parse subject and body
+        subject = _decode_header_value(msg.get("Subject", ""))
+        body = _extract_body(msg)
+        message_id = msg.get("Message-ID", "")
+
+        return {
+            "uid": uid.decode() if isinstance(uid, bytes) else str(uid),
+            "from_email": from_email,
+            "from_name": from_name,
+            "subject": subject,
+            "body": body.strip(),
+            "message_id": message_id,
+        }
+
     async def send_message(self, to: str, content: str,
                            attachments: Optional[List[str]] = None,
                            **kwargs) -> bool:
@@ -339,15 +667,30 @@ class EmailChannelAdapter(ChannelAdapter):
         # Get subject from kwargs or generate default
         subject = kwargs.get("subject", "Re: Agent Zero")
 
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._send_smtp,
-                recipient,
-                subject,
-                content,
+        # Tools call in from their own loops; hand the send to the adapter's
+        # loop, which owns the SMTP lock and session
+        home = self._loop
+        if home is not None and home.is_running() and home is not asyncio.get_running_loop():
+            future = asyncio.run_coroutine_threadsafe(
+                self._deliver(recipient, subject, content), home
             )
+            return await asyncio.wrap_future(future)
+        return await self._deliver(recipient, subject, content)
+
+    async def _deliver(self, recipient: str, subject: str, content: str) -> bool:
+        """Send one email over the pooled session, serialized by _smtp_lock."""
+        try:
+            async with self._smtp_lock:
+                if HAS_AIOSMTPLIB:
+                    await self._send_aiosmtp(recipient, subject, content)
+                else:
+                    await asyncio.get_running_loop().run_in_executor(
+                        self._smtp_executor,
+                        self._send_smtp,
+                        recipient,
+                        subject,
+                        content,
+                    )
             logger.info(f"Email sent to {recipient}")
             return True
         except Exception as e:
@@ -356,50 +699,53 @@ class EmailChannelAdapter(ChannelAdapter):
 
     def _markdown_to_html(self, text: str) -> str:
         """Convert markdown-ish text to HTML for rich email rendering."""
-        # Escape HTML entities first
-        text = html.escape(text)
-
-        # Convert markdown bold **text** to <strong>
-        text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-        # Convert markdown italic *text* to <em> (but not inside strong)
-        text = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'<em>\1</em>', text)
-
-        # Convert markdown headers
-        text = re.sub(r'^### (.+)$', r'<h3 style="color:#2563eb;margin:16px 0 8px 0;">\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^## (.+)$', r'<h2 style="color:#1d4ed8;margin:20px 0 10px 0;">\1</h2>', text, flags=re.MULTILINE)
-        text = re.sub(r'^# (.+)$', r'<h1 style="color:#1e40af;margin:24px 0 12px 0;">\1</h1>', text, flags=re.MULTILINE)
-
-        # Convert markdown links [text](url) to <a href>
-        text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" style="color:#2563eb;">\1</a>', text)
-
-        # Convert bare URLs to clickable links
-        text = re.sub(
-            r'(?<!href=")(https?://[^\s<>"\)]+)',
-            r'<a href="\1" style="color:#2563eb;">\1</a>',
-            text
-        )
-
-        # Convert unordered lists (- item or * item)
-        text = re.sub(r'^[\-\*] (.+)$', r'<li>\1</li>', text, flags=re.MULTILINE)
-        # Wrap consecutive <li> items in <ul>
-        text = re.sub(r'((?:<li>.*?</li>\n?)+)', r'<ul style="margin:8px 0;padding-left:24px;">\1</ul>', text)
-
-        # Convert numbered lists (1. item)
-        text = re.sub(r'^\d+\. (.+)$', r'<li>\1</li>', text, flags=re.MULTILINE)
-        # Note: numbered <li> items also get wrapped; could enhance further
-
-        # Convert --- horizontal rules
-        text = re.sub(r'^---+$', r'<hr style="border:none;border-top:1px solid #e5e7eb;margin:16px 0;">', text, flags=re.MULTILINE)
-
-        # Convert line breaks to <br> for remaining plain text lines
-        text = re.sub(r'\n(?!<)', r'<br>\n', text)
-
-        return text
+        rendered = []
+        open_list = None  # "ul" / "ol" while consecutive list items are being emitted
+
+        # Escape HTML entities first, then a single pass over the lines
+        for line in html.escape(text).split("\n"):
+            block = _RE_BLOCK.match(line)
+            kind = block.lastgroup if block else None
+
+            if kind == "ul" or kind == "ol":
+                out = f"<li>{_inline_md(block.group(kind))}</li>"
+                if open_list != kind:
+                    out = _LIST_OPEN[kind] + out
+                    if open_list:
+                        out = f"</{open_list}>" + out
+                    open_list = kind
+                rendered.append(out)
+                continue
 
-    def _load_template(self) -> str:
-        """Load the HTML email template, with caching."""
-        if hasattr(self, "_cached_template") and self._cached_template:
-            return self._cached_template
+            if kind == "heading":
+                hashes = block.group("hashes")
+                out = f"{_HEADING_OPEN[hashes]}{_inline_md(block.group('heading'))}</h{len(hashes)}>"
+            elif kind == "hr":
+                out = _HR_HTML
+            else:
+                out = _inline_md(line)
+            if open_list:
+                out = f"</{open_list}>" + out
+                open_list = None
+            rendered.append(out)
+
+        if open_list:
+            rendered[-1] += f"</{open_list}>"
+
+        # Line breaks become <br> unless the next line starts with a tag
+        parts = [rendered[0]]
+        for out in rendered[1:]:
+            parts.append("\n" if out.startswith("<") else "<br>\n")
+            parts.append(out)
+        return "".join(parts)
+
+    def _load_template(self) -> List[str]:
+        """
+        Load the HTML email template, pre-split at its placeholders and
+        cached. Placeholders sit at the odd indices of the returned list.
+        """
+        if self._template_parts:
+            return self._template_parts
 
         template_path = os.path.join(
             os.path.dirname(os.path.abspath(__file__)),
@@ -407,17 +753,27 @@ class EmailChannelAdapter(ChannelAdapter):
         )
         try:
             with open(template_path, "r", encoding="utf-8") as f:
-                self._cached_template = f.read()
+                self._template_parts = _TEMPLATE_MARK_RE.split(f.read())
             logger.info("Loaded email template from %s", template_path)
-            return self._cached_template
+            return self._template_parts
         except FileNotFoundError:
             logger.warning("email_template.html not found, using fallback")
-            return ""
+            return []
 
-    def _send_smtp(self, recipient: str, subject: str, body: str):
-        """Blocking: send an email via SMTP with HTML formatting."""
+    def _build_message(self, recipient: str, subject: str, body: str) -> MIMEText | MIMEMultipart:
+        """
+        Build the message for a reply: plain + HTML multipart, or plain text
+        alone for short bodies with no markdown to render.
+        """
         from datetime import datetime
 
+        if len(body) < _PLAIN_ONLY_MAX_CHARS and not _RE_HAS_MARKDOWN.search(body):
+            msg = MIMEText(body, "plain", "utf-8")
+            msg["From"] = self.smtp_user
+            msg["To"] = recipient
+            msg["Subject"] = subject
+            return msg
+
         msg = MIMEMultipart("alternative")
         msg["From"] = self.smtp_user
         msg["To"] = recipient
@@ -428,14 +784,19 @@ class EmailChannelAdapter(ChannelAdapter):
 
         # Rich HTML version — use template if available
         html_body = self._markdown_to_html(body)
-        template = self._load_template()
-
-        if template:
-            # Inject content into the branded template
-            html_email = template.replace("{{CONTENT}}", html_body)
-            html_email = html_email.replace("{{SUBJECT}}", html.escape(subject))
-            html_email = html_email.replace("{{DATE}}", datetime.now().strftime("%b %d, %Y • %I:%M %p"))
-            html_email = html_email.replace("{{SENDER_EMAIL}}", html.escape(self.smtp_user or ""))
+        template_parts = self._load_template()
+
+        if template_parts:
+            # Inject content into the branded template in a single join
+            values = {
+                "{{CONTENT}}": html_body,
+                "{{SUBJECT}}": html.escape(subject),
+                "{{DATE}}": datetime.now().strftime("%b %d, %Y • %I:%M %p"),
+                "{{SENDER_EMAIL}}": self._sender_email_html,
+            }
+            segments = template_parts[:]
+            segments[1::2] = [values[mark] for mark in template_parts[1::2]]
+            html_email = "".join(segments)
         else:
             # Fallback: inline HTML (no template file)
             html_email = f"""\
@@ -453,16 +814,120 @@ class EmailChannelAdapter(ChannelAdapter):
 </html>"""
 
         msg.attach(MIMEText(html_email, "html", "utf-8"))
+        return msg
+
+    def _send_smtp(self, recipient: str, subject: str, body: str):
+        """Blocking: send an email via SMTP with HTML formatting."""
+        msg = self._build_message(recipient, subject, body)
+
+        server = self._get_smtp()
+        try:
+            server.send_message(msg)
+        except Exception:
+            self._close_smtp()
+            raise
+
+        self._smtp_count += 1
+        if (self._smtp_count >= self.SMTP_MAX_MESSAGES
+                or time.monotonic() - self._smtp_opened > self.SMTP_MAX_AGE_SECONDS):
+            self._close_smtp()
+
+    def _get_smtp(self) -> smtplib.SMTP | smtplib.SMTP_SSL:
+        """Blocking: return the pooled SMTP session, reconnecting if NOOP fails."""
+        if self._smtp is not None:
+            try:
+                code, _ = self._smtp.noop()
+                if code == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
 
         if self.use_tls and self.smtp_port == 465:
             # SSL/TLS on connect (port 465)
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
         else:
             # STARTTLS (port 587) or plain
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        try:
+            if self.use_tls and self.smtp_port != 465:
+                server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+
+        self._smtp = server
+        self._smtp_count = 0
+        self._smtp_opened = time.monotonic()
+        return server
+
+    def _close_smtp(self):
+        """Blocking: QUIT the pooled SMTP session and drop it."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+    async def _send_aiosmtp(self, recipient: str, subject: str, body: str):
+        """
+        Send an email over the pooled aiosmtplib session, on the event loop
+        (no executor hop). Same recycling rules as _send_smtp.
+        """
+        msg = self._build_message(recipient, subject, body)
+
+        server = await self._get_aiosmtp()
+        try:
+            await server.send_message(msg)
+        except Exception:
+            await self._close_aiosmtp()
+            raise
+
+        self._smtp_count += 1
+        if (self._smtp_count >= self.SMTP_MAX_MESSAGES
+                or time.monotonic() - self._smtp_opened > self.SMTP_MAX_AGE_SECONDS):
+            await self._close_aiosmtp()
+
+    async def _get_aiosmtp(self):
+        """Return the pooled aiosmtplib session, reconnecting if NOOP fails."""
+        if self._asmtp is not None:
+            try:
+                response = await self._asmtp.noop()
+                if response.code == 250:
+                    return self._asmtp
+            except (aiosmtplib.SMTPException, OSError):
+                pass
+            await self._close_aiosmtp()
+
+        # SSL/TLS on connect (port 465), otherwise STARTTLS (port 587) or plain
+        implicit_tls = self.use_tls and self.smtp_port == 465
+        server = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            use_tls=implicit_tls,
+            start_tls=self.use_tls and not implicit_tls,
+        )
+        await server.connect()
+        try:
+            await server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+
+        self._asmtp = server
+        self._smtp_count = 0
+        self._smtp_opened = time.monotonic()
+        return server
+
+    async def _close_aiosmtp(self):
+        """QUIT the pooled aiosmtplib session and drop it."""
+        if self._asmtp is None:
+            return
+        try:
+            await self._asmtp.quit()
+        except Exception:
+            self._asmtp.close()
+        self._asmtp = None
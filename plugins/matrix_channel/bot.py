@@ -13,10 +13,9 @@ Requires: pip install matrix-nio
 
 from __future__ import annotations
 import os
-import re
 import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Set
 
 try:
     from nio import AsyncClient, RoomMessageText, MatrixRoom
@@ -30,15 +29,23 @@ logger = logging.getLogger("agent-zero.plugins.matrix")
 
 
 # --- OpenClaw #22359: Overload error classification ---
-_OVERLOAD_PATTERNS = re.compile(
-    r"(overloaded|service.unavailable|high.demand|503|502|temporarily.unavailable)",
-    re.IGNORECASE,
+# Plain substring checks on the lower-cased message; matrix-nio errors can
+# embed whole response bodies, so no regex scanning over them
+_OVERLOAD_TOKENS = (
+    "overloaded",
+    "service unavailable",
+    "service_unavailable",
+    "high demand",
+    "503",
+    "502",
+    "temporarily unavailable",
 )
 
 
 def _is_overload_error(error: Exception) -> bool:
     """Classify overloaded/service-unavailable as transient timeout, not rate limit."""
-    return bool(_OVERLOAD_PATTERNS.search(str(error)))
+    message = str(error).lower()
+    return any(token in message for token in _OVERLOAD_TOKENS)
 
 
 class MatrixChannelAdapter(ChannelAdapter):
@@ -56,6 +63,9 @@ class MatrixChannelAdapter(ChannelAdapter):
     RECONNECT_INITIAL_DELAY = 5.0
     RECONNECT_MAX_DELAY = 300.0  # 5 minutes
 
+    # Max in-flight room_send calls when chunks are sent unordered
+    CHUNK_SEND_CONCURRENCY = 4
+
     def __init__(
         self,
         homeserver_url: str = "https://matrix.org",
@@ -177,6 +187,10 @@ class MatrixChannelAdapter(ChannelAdapter):
         Send a message to a Matrix room.
 
         'to' format: "room:<room_id>" (e.g. "room:!abc123:matrix.org")
+
+        Long messages are split into chunks and sent in order. Pass
+        ordered=False to send the chunks concurrently (faster, but the room
+        may show them out of order).
         """
         if not self._client:
             logger.error("Matrix client not connected")
@@ -190,19 +204,21 @@ class MatrixChannelAdapter(ChannelAdapter):
             logger.error(f"Invalid 'to' format: {to}. Use 'room:<room_id>'")
             return False
 
+        chunks = self._split_message(content, max_length=65535)
+        ordered = kwargs.get("ordered", True)
+        # Indices of chunks not yet delivered; a retry resumes from these
+        # rather than re-sending chunks the room already has
+        pending = set(range(len(chunks)))
+
         # OpenClaw #22359: Retry on overload with exponential backoff
         for attempt in range(self.MAX_RETRIES):
             try:
-                chunks = self._split_message(content, max_length=65535)
-                for chunk in chunks:
-                    await self._client.room_send(
-                        room_id=room_id,
-                        message_type="m.room.message",
-                        content={
-                            "msgtype": "m.text",
-                            "body": chunk,
-                        },
-                    )
+                if ordered:
+                    for index in sorted(pending):
+                        await self._send_chunk(room_id, chunks[index])
+                        pending.discard(index)
+                else:
+                    await self._send_chunks_concurrently(room_id, chunks, pending)
                 return True
             except Exception as e:
                 if _is_overload_error(e) and attempt < self.MAX_RETRIES - 1:
@@ -214,21 +230,59 @@ class MatrixChannelAdapter(ChannelAdapter):
                     return False
         return False
 
+    async def _send_chunk(self, room_id: str, chunk: str):
+        """Send one text chunk to a room."""
+        await self._client.room_send(
+            room_id=room_id,
+            message_type="m.room.message",
+            content={
+                "msgtype": "m.text",
+                "body": chunk,
+            },
+        )
+
+    async def _send_chunks_concurrently(self, room_id: str, chunks: List[str], pending: Set[int]):
+        """
+        Send the pending chunks concurrently, at most CHUNK_SEND_CONCURRENCY
+        at a time. Delivered indices are removed from pending; the first
+        failure is re-raised once all sends have settled.
+        """
+        sem = asyncio.Semaphore(self.CHUNK_SEND_CONCURRENCY)
+
+        async def _send(index: int):
+            async with sem:
+                await self._send_chunk(room_id, chunks[index])
+            pending.discard(index)
+
+        results = await asyncio.gather(
+            *(_send(index) for index in sorted(pending)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
     @staticmethod
     def _split_message(content: str, max_length: int = 65535) -> List[str]:
         """Split a long message into chunks."""
         if len(content) <= max_length:
             return [content]
+        # Walk a cursor through the original string instead of re-slicing
+        # the remainder each round, so total work stays linear
         chunks = []
-        while content:
-            if len(content) <= max_length:
-                chunks.append(content)
-                break
-            split_at = content.rfind("\n", 0, max_length)
+        pos, end = 0, len(content)
+        while end - pos > max_length:
+            limit = pos + max_length
+            split_at = content.rfind("\n", pos, limit)
             if split_at == -1:
-                split_at = content.rfind(" ", 0, max_length)
+                split_at = content.rfind(" ", pos, limit)
             if split_at == -1:
-                split_at = max_length
-            chunks.append(content[:split_at])
-            content = content[split_at:].lstrip()
+                split_at = limit
+            chunks.append(content[pos:split_at])
+            # Skip the whitespace the next chunk would otherwise start with
+            pos = split_at
+            while pos < end and content[pos].isspace():
+                pos += 1
+        if pos < end:
+            chunks.append(content[pos:])
         return chunks
@@ -198,6 +198,7 @@ class SubAgentManager:
     def __init__(self, config: Optional[SubAgentConfig] = None):
         self.config = config or SubAgentConfig()
         self._active: Dict[str, Dict[str, Any]] = {}  # parent_id -> {child_id: info}
+        self._total = 0  # Number of children across all parents
 
     def can_spawn(self, parent_id: str, current_depth: int = 0) -> bool:
         """Check if a new sub-agent can be spawned."""
@@ -214,16 +215,19 @@ class SubAgentManager:
 
     def register_child(self, parent_id: str, child_id: str, info: Dict[str, Any] = None):
         """Register a spawned sub-agent."""
-        if parent_id not in self._active:
-            self._active[parent_id] = {}
-        self._active[parent_id][child_id] = info or {}
+        children = self._active.setdefault(parent_id, {})
+        if child_id not in children:
+            self._total += 1
+        children[child_id] = info or {}
         logger.info(f"Sub-agent {child_id} spawned by {parent_id}")
 
     def remove_child(self, parent_id: str, child_id: str):
         """Remove a completed sub-agent."""
-        if parent_id in self._active:
-            self._active[parent_id].pop(child_id, None)
-            if not self._active[parent_id]:
+        children = self._active.get(parent_id)
+        if children is not None:
+            if children.pop(child_id, None) is not None:
+                self._total -= 1
+            if not children:
                 del self._active[parent_id]
 
     def list_children(self, parent_id: str) -> Dict[str, Any]:
@@ -234,6 +238,18 @@ class SubAgentManager:
         """List all active sub-agents."""
         return dict(self._active)
 
+    @property
+    def total_count(self) -> int:
+        """Number of active sub-agents across all parents."""
+        return self._total
+
+    def kill_all(self) -> int:
+        """Forget all active sub-agents. Returns how many were removed."""
+        count = self._total
+        self._active.clear()
+        self._total = 0
+        return count
+
 
 # --- Per-Channel Model Override ---
 
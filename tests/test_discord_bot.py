@@ -0,0 +1,121 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.discord_channel import bot
+from plugins.discord_channel.bot import DiscordChannelAdapter
+
+
+@pytest.fixture
+def extract():
+    adapter = DiscordChannelAdapter.__new__(DiscordChannelAdapter)
+    return adapter._extract_file_paths
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "Image saved to {path}.",
+        "File saved to {path}, enjoy",
+        "**Saved to:** {path}.",
+        "Output: {path};",
+        "Generated `{path}`.",
+    ],
+)
+def test_auto_attach_finds_paths_followed_by_punctuation(extract, tmp_path, template):
+    image = tmp_path / "a.png"
+    image.write_bytes(b"png")
+    assert extract(template.format(path=image)) == [str(image)]
+
+
+def test_auto_attach_skips_missing_and_unlisted_files(extract, tmp_path):
+    (tmp_path / "notes.exe").write_bytes(b"x")
+    text = f"saved to {tmp_path / 'missing.png'} and {tmp_path / 'notes.exe'}"
+    assert extract(text) == []
+
+
+class FakeResponse:
+    def __init__(self, session, url):
+        self.session = session
+        self.url = url
+        self.status = 404 if "missing" in url else 200
+        self.content_length = None
+        self.content = self
+
+    async def __aenter__(self):
+        self.session.in_flight += 1
+        self.session.peak = max(self.session.peak, self.session.in_flight)
+        # Later URLs finish first
+        await asyncio.sleep(0.01 * (10 - int(self.url[-5])))
+        return self
+
+    async def __aexit__(self, *exc):
+        self.session.in_flight -= 1
+
+    async def iter_chunked(self, size):
+        yield self.url.encode()
+
+
+class FakeSession:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    def get(self, url):
+        return FakeResponse(self, url)
+
+
+def test_url_attachments_download_concurrently_in_input_order(monkeypatch, tmp_path):
+    local = tmp_path / "local.txt"
+    local.write_text("hi")
+    monkeypatch.setattr(
+        bot, "discord",
+        SimpleNamespace(File=lambda fp, filename: (filename, fp if isinstance(fp, str) else fp.read())),
+        raising=False,
+    )
+    adapter = DiscordChannelAdapter.__new__(DiscordChannelAdapter)
+    session = FakeSession()
+
+    async def get_session():
+        return session
+
+    adapter._get_http_session = get_session
+    urls = [f"https://x.test/f{n}.png" for n in range(1, 4)]
+    attachments = [urls[0], str(local), "https://x.test/missing4.png", urls[1], urls[2]]
+
+    files = asyncio.run(adapter._prepare_attachments(attachments))
+
+    assert files == [
+        ("f1.png", urls[0].encode()),
+        ("local.txt", str(local)),
+        ("f2.png", urls[1].encode()),
+        ("f3.png", urls[2].encode()),
+    ]
+    assert session.peak == 4
+
+
+def test_target_locks_serialize_sends_and_are_dropped_when_idle():
+    adapter = DiscordChannelAdapter.__new__(DiscordChannelAdapter)
+    adapter._send_locks = bot.weakref.WeakValueDictionary()
+    order = []
+
+    async def send(target_id, label):
+        async with adapter._target_lock(target_id):
+            order.append(f"{label} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{label} end")
+
+    async def run():
+        await asyncio.gather(send(1, "a"), send(1, "b"), send(2, "c"))
+        return len(adapter._send_locks)
+
+    assert asyncio.run(run()) == 0
+    assert order.index("a end") < order.index("b start")
+    assert order.index("c start") < order.index("a end")
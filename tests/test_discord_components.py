@@ -0,0 +1,20 @@
+import re
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.discord_channel.components import _gen_custom_id
+
+
+def test_custom_ids_are_prefixed_fixed_width_hex():
+    custom_id = _gen_custom_id("a0_btn_")
+    assert re.fullmatch(r"a0_btn_[0-9a-f]{8}", custom_id)
+    assert len(_gen_custom_id("x" * 90)) <= 100  # Discord's custom_id limit
+
+
+def test_custom_ids_do_not_repeat():
+    ids = [_gen_custom_id("a0_sel_") for _ in range(100_000)]
+    assert len(set(ids)) == len(ids)
@@ -0,0 +1,98 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.discord_channel import pairing
+from plugins.discord_channel.pairing import PairingManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = SimpleNamespace(now=time.time())
+    monkeypatch.setattr(pairing, "time", SimpleNamespace(time=lambda: fake.now))
+    return fake
+
+
+@pytest.fixture
+def pm(tmp_path):
+    return PairingManager(
+        policy="pairing",
+        owner_user_id="owner",
+        data_dir=str(tmp_path),
+        max_pending_per_channel=2,
+        code_ttl_seconds=60,
+    )
+
+
+def test_indexes_enforce_one_request_per_sender_and_channel_cap(pm):
+    first = pm.create_request("u1", "One", "c1")
+    assert first is not None
+    assert pm.create_request("u1", "One", "c1") is None  # already pending
+    assert pm.create_request("u2", "Two", "c1") is not None
+    assert pm.create_request("u3", "Three", "c1") is None  # channel full
+    assert pm.create_request("u3", "Three", "c2") is not None
+    assert pm.create_request("owner", "Owner", "c3") is None  # already authorized
+
+    assert pm.deny_code(first.code.lower()) is first
+    assert "u1" not in pm._pending_by_sender
+    assert len(pm._pending_by_channel["c1"]) == 1
+    assert pm.create_request("u4", "Four", "c1") is not None
+
+
+def test_approve_authorizes_and_clears_indexes(pm):
+    request = pm.create_request("u1", "One", "c1")
+    code = f"{request.code[:4]}-{request.code[4:]}".lower()
+
+    assert pm.approve_code(code) is request
+    assert pm.is_authorized("u1")
+    assert pm._pending == {}
+    assert pm._pending_by_sender == {}
+    assert pm._pending_by_channel == {}
+    assert pm.approve_code(request.code) is None
+
+
+def test_expired_requests_leave_the_heap_and_indexes(pm, clock):
+    old = pm.create_request("u1", "One", "c1")
+    clock.now += 30
+    pm.create_request("u2", "Two", "c1")
+
+    clock.now += 40  # u1's code expired, u2's has 20s left
+    assert [r.sender_id for r in pm.list_pending()] == ["u2"]
+    assert pm.approve_code(old.code) is None
+    assert pm.create_request("u1", "One", "c1") is not None  # slot and sender freed
+
+    clock.now += 60
+    assert pm.list_pending() == []
+    assert pm._pending_by_sender == {}
+    assert pm._pending_by_channel == {}
+    assert pm._expiry_heap == []
+
+
+def test_stale_heap_entry_does_not_drop_a_live_request(pm, clock):
+    request = pm.create_request("u1", "One", "c1")
+    pm.deny_code(request.code)
+    # Same code re-issued later with a later expiry
+    reissued = pairing.PairingRequest.create(request.code, "u2", "Two", "c1", ttl=600)
+    pm._add_request(reissued)
+
+    clock.now += 120  # first entry is due; the reissued one is not
+    assert pm.list_pending() == [reissued]
+    assert pm._pending_by_sender == {"u2": request.code}
+
+
+@pytest.mark.parametrize(
+    "typed",
+    ["{code}\r\n", "\u00a0{code}\u00a0", " {lower} ", "{a}-{b}", "{a} {b}\r"],
+)
+def test_typed_codes_are_canonicalized(pm, typed):
+    request = pm.create_request("u1", "One", "c1")
+    code = request.code
+    text = typed.format(code=code, lower=code.lower(), a=code[:4], b=code[4:])
+    assert pm.approve_code(text) is request
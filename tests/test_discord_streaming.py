@@ -0,0 +1,75 @@
+import asyncio
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.discord_channel import streaming
+from plugins.discord_channel.streaming import DiscordStreamingReply, TYPING_INDICATOR
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+        self.hold_partial_edits = False
+        self.partial_entered = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def edit(self, content):
+        if self.hold_partial_edits and content.endswith(TYPING_INDICATOR):
+            self.partial_entered.set()
+            await self.release.wait()
+        self.content = content
+
+
+class FakeChannel:
+    _next_id = 1000
+
+    def __init__(self):
+        FakeChannel._next_id += 1
+        self.id = FakeChannel._next_id
+        self.sent = []
+
+    async def send(self, content):
+        message = FakeMessage(content)
+        self.sent.append(message)
+        return message
+
+
+def test_trailing_edit_in_flight_cannot_land_after_final_edit(monkeypatch):
+    monkeypatch.setattr(streaming, "EDIT_THROTTLE_SECONDS", 0.01)
+
+    async def run():
+        reply = DiscordStreamingReply(FakeChannel(), mode="partial")
+        await reply.start()
+        await reply.append("hello")  # immediate partial edit
+
+        message = reply._message
+        message.hold_partial_edits = True
+        await reply.append(" world")  # throttled: schedules the trailing edit
+        await asyncio.wait_for(message.partial_entered.wait(), timeout=1)
+
+        finish = asyncio.ensure_future(reply.finish())
+        await asyncio.sleep(0)
+        message.release.set()  # trailing edit completes after finish() began
+        await asyncio.wait_for(finish, timeout=1)
+        return message.content
+
+    assert asyncio.run(run()) == "hello world"
+
+
+def test_trailing_edit_not_yet_sent_is_dropped_after_finish(monkeypatch):
+    monkeypatch.setattr(streaming, "EDIT_THROTTLE_SECONDS", 0.01)
+
+    async def run():
+        reply = DiscordStreamingReply(FakeChannel(), mode="partial")
+        await reply.start()
+        await reply.append("hello")
+        await reply.append(" world")
+        text = await reply.finish()
+        await asyncio.sleep(0.05)  # past the trailing-edit timer
+        return text, reply._message.content
+
+    assert asyncio.run(run()) == ("hello world", "hello world")
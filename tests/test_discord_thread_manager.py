@@ -0,0 +1,180 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.discord_channel import thread_manager
+from plugins.discord_channel.thread_manager import ThreadBindingManager
+
+
+def _ids(bindings):
+    return [b.thread_id for b in bindings]
+
+
+def test_filtered_listing_keeps_bind_order():
+    tm = ThreadBindingManager()
+    for tid, user, guild in [(30, "u1", "g1"), (10, "u2", "g1"), (20, "u1", "g1"), (5, "u1", "g2")]:
+        tm.bind(tid, target="agent", user_id=user, guild_id=guild)
+    tm.bind(30, target="other", user_id="u1", guild_id="g1")  # rebind moves to the end
+
+    assert _ids(tm.list_bindings()) == [10, 20, 5, 30]
+    assert _ids(tm.list_bindings(guild_id="g1")) == [10, 20, 30]
+    assert _ids(tm.list_bindings(user_id="u1")) == [20, 5, 30]
+    assert _ids(tm.list_bindings(guild_id="g1", user_id="u1")) == [20, 30]
+    assert tm.list_bindings(guild_id="g3") == []
+    assert _ids(tm.get_bindings_for_target("agent")) == [10, 20, 5]
+
+
+def test_unbind_drops_index_entries():
+    tm = ThreadBindingManager()
+    tm.bind(1, target="agent", user_id="u1", guild_id="g1")
+    tm.unbind(1)
+    assert tm.list_bindings(guild_id="g1") == []
+    assert tm.get_targets() == []
+    assert (tm._by_target, tm._by_guild, tm._by_user) == ({}, {}, {})
+
+
+class FakeMono:
+    """Stands in for thread_manager._mono, starting from the real clock."""
+
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeMono()
+    monkeypatch.setattr(thread_manager, "_mono", fake)
+    return fake
+
+
+def test_expire_stale_pops_only_idle_bindings(clock):
+    tm = ThreadBindingManager(ttl_hours=1)
+    for tid in (1, 2, 3):
+        tm.bind(tid, target="agent", user_id="u1", guild_id="g1")
+
+    clock.now += 1800
+    tm.get_and_touch(2)
+    assert tm.expire_stale() == []
+
+    clock.now += 2000  # 1 and 3 idle past the TTL, 2 touched 2000s ago
+    assert _ids(tm.expire_stale()) == [1, 3]
+    assert _ids(tm.list_bindings(guild_id="g1")) == [2]
+    assert _ids(tm.get_bindings_for_target("agent")) == [2]
+
+    clock.now += 3600
+    assert _ids(tm.expire_stale()) == [2]
+    assert tm.count() == 0
+    assert tm._expiry_heap == []
+
+
+def test_expire_stale_skips_unbound_and_rebound_entries(clock):
+    tm = ThreadBindingManager(ttl_hours=1)
+    tm.bind(1, target="agent", user_id="u1")
+    tm.bind(2, target="agent", user_id="u1")
+    tm.unbind(1)
+    clock.now += 1800
+    rebound = tm.bind(2, target="other", user_id="u1")
+    tm.get_and_touch(2)
+
+    clock.now += 2000
+    assert tm.expire_stale() == []
+    assert tm.get_binding(2) is rebound
+
+    clock.now += 1800
+    assert tm.expire_stale() == [rebound]
+
+
+def test_expire_stale_disabled_ttl_keeps_everything(clock):
+    tm = ThreadBindingManager(ttl_hours=0)
+    tm.bind(1, target="agent", user_id="u1")
+    clock.now += 10 ** 6
+    assert tm.expire_stale() == []
+    assert tm.count() == 1
+
+
+def test_expiry_heap_is_compacted_after_many_rebinds():
+    tm = ThreadBindingManager(ttl_hours=1)
+    for n in range(500):
+        tm.bind(n % 5, target=f"agent{n}", user_id="u1")
+    assert tm.count() == 5
+    assert len(tm._expiry_heap) <= 2 * tm.count() + 65
+
+
+def test_callback_worker_runs_events_in_order_and_survives_errors():
+    seen = []
+
+    async def on_bind(binding):
+        await asyncio.sleep(0)
+        seen.append(("bind", binding.thread_id))
+
+    def on_unbind(binding):
+        if binding.thread_id == 1:
+            raise RuntimeError("boom")
+        seen.append(("unbind", binding.thread_id))
+
+    async def run():
+        tm = ThreadBindingManager()
+        tm.on_bind(on_bind)
+        tm.on_unbind(on_unbind)
+        # A plain callable handing back a coroutine is awaited too
+        tm.on_expire(lambda binding: on_bind(binding))
+        for tid in (1, 2):
+            tm.bind(tid, target="agent", user_id="u1")
+        tm.unbind(1)
+        tm.unbind(2)
+        tm._emit(tm._on_expire, tm.bind(3, target="agent", user_id="u1"))
+        while not tm._cb_queue.empty():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        worker = tm._cb_worker
+        await tm.stop_cleanup_loop()
+        return worker
+
+    worker = asyncio.run(run())
+    assert seen == [("bind", 1), ("bind", 2), ("unbind", 2), ("bind", 3), ("bind", 3)]
+    assert worker.cancelled()
+
+
+def test_events_queued_outside_a_loop_run_once_the_worker_starts():
+    seen = []
+    tm = ThreadBindingManager(cleanup_interval=3600)
+    tm.on_bind(lambda binding: seen.append(binding.thread_id))
+    tm.bind(7, target="agent", user_id="u1")  # no running loop yet
+    assert tm._cb_worker is None
+
+    async def run():
+        await tm.start_cleanup_loop()
+        await asyncio.sleep(0.01)
+        await tm.stop_cleanup_loop()
+
+    asyncio.run(run())
+    assert seen == [7]
+
+
+def test_get_and_touch_cache_never_returns_a_stale_binding(clock):
+    tm = ThreadBindingManager(ttl_hours=1)
+    first = tm.bind(1, target="agent", user_id="u1")
+    assert tm.get_and_touch(1) is first
+    assert tm.get_and_touch(1).message_count == 2  # cached slot still touches
+
+    second = tm.bind(1, target="other", user_id="u1")  # rebind
+    assert tm.get_and_touch(1) is second
+
+    tm.unbind(1)
+    assert tm.get_and_touch(1) is None
+
+    third = tm.bind(1, target="agent", user_id="u1")
+    assert tm.get_and_touch(1) is third
+    clock.now += 7200
+    assert tm.expire_stale() == [third]
+    assert tm.get_and_touch(1) is None
@@ -0,0 +1,124 @@
+import asyncio
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.email_channel.bot import EmailChannelAdapter
+
+RAW_ALLOWED = b"From: Alice <alice@example.com>\r\nSubject: hi\r\nMessage-ID: <1@x>\r\n\r\nbody one\r\n"
+RAW_OTHER = b"From: Bob <bob@example.com>\r\nSubject: yo\r\n\r\nbody two\r\n"
+
+
+class FakeIMAP:
+    """imaplib-style connection answering UID SEARCH/FETCH/STORE."""
+
+    def __init__(self, messages):
+        self.messages = messages  # uid bytes -> raw message (None = broken literal)
+        self.calls = []
+
+    def noop(self):
+        return "OK", [b""]
+
+    def select(self, mailbox):
+        return "OK", [b"1"]
+
+    def uid(self, command, *args):
+        self.calls.append((command,) + args)
+        if command == "SEARCH":
+            return "OK", [b" ".join(self.messages)]
+        if command == "FETCH":
+            data = []
+            for n, uid in enumerate(args[0].split(b","), 1):
+                data.append((b"%d (UID %s BODY[] {10}" % (n, uid), self.messages[uid]))
+                data.append(b")")
+            return "OK", data
+        return "OK", []
+
+    def stores(self):
+        return [call for call in self.calls if call[0] == "STORE"]
+
+
+Response = namedtuple("Response", "result lines")
+
+
+class FakeAioIMAP:
+    """aioimaplib-style client answering uid_search / uid."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.calls = []
+
+    async def uid_search(self, criteria):
+        return Response("OK", [b" ".join(self.messages), b"SEARCH completed"])
+
+    async def uid(self, command, *args):
+        self.calls.append((command,) + args)
+        if command == "fetch":
+            lines = []
+            for n, uid in enumerate(args[0].encode().split(b","), 1):
+                lines.append(b"%d FETCH (UID %s BODY[] {10}" % (n, uid))
+                lines.append(bytearray(self.messages[uid] or b""))
+                lines.append(b")")
+            lines.append(b"FETCH completed")
+            return Response("OK", lines)
+        return Response("OK", [])
+
+
+def _adapter(conn=None):
+    adapter = EmailChannelAdapter(allowed_senders="alice@example.com")
+    if conn is not None:
+        adapter._connect_imap = lambda: conn
+    return adapter
+
+
+def test_batched_fetch_marks_only_accepted_mail_as_seen():
+    conn = FakeIMAP({b"5": RAW_ALLOWED, b"7": RAW_OTHER, b"9": None})
+    adapter = _adapter(conn)
+
+    results = adapter._fetch_unseen()
+
+    assert [r["uid"] for r in results] == ["5"]
+    assert results[0]["from_email"] == "alice@example.com"
+    assert results[0]["body"] == "body one"
+    fetches = [call for call in conn.calls if call[0] == "FETCH"]
+    assert fetches == [("FETCH", b"5,7,9", "(BODY.PEEK[])")]
+    assert conn.stores() == [("STORE", b"5", "+FLAGS", "(\\Seen)")]
+
+
+def test_skipped_mail_stays_unread_and_is_not_fetched_again():
+    conn = FakeIMAP({b"5": RAW_ALLOWED, b"7": RAW_OTHER})
+    adapter = _adapter(conn)
+    adapter._fetch_unseen()
+
+    del conn.messages[b"5"]  # marked seen, so no longer UNSEEN
+    conn.calls.clear()
+    assert adapter._fetch_unseen() == []
+    assert conn.calls == [("SEARCH", None, "UNSEEN")]
+
+    # Once read elsewhere it drops out of the skip set
+    del conn.messages[b"7"]
+    adapter._fetch_unseen()
+    assert adapter._skipped_uids == set()
+
+
+def test_no_store_when_nothing_accepted():
+    conn = FakeIMAP({b"7": RAW_OTHER})
+    adapter = _adapter(conn)
+    assert adapter._fetch_unseen() == []
+    assert conn.stores() == []
+
+
+def test_async_fetch_peeks_and_marks_only_accepted_mail_as_seen():
+    client = FakeAioIMAP({b"5": RAW_ALLOWED, b"7": RAW_OTHER, b"9": None})
+    adapter = _adapter()
+
+    results = asyncio.run(adapter._fetch_unseen_async(client))
+
+    assert [r["uid"] for r in results] == ["5"]
+    assert client.calls[0] == ("fetch", "5,7,9", "(BODY.PEEK[])")
+    assert client.calls[1:] == [("store", "5", "+FLAGS", "(\\Seen)")]
+    assert adapter._skipped_uids == {b"7", b"9"}
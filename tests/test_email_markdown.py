@@ -0,0 +1,123 @@
+import html
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.email_channel.bot import EmailChannelAdapter
+
+LINK = 'style="color:#2563eb;"'
+
+
+def reference_markdown_to_html(text):
+    """The original regex-cascade renderer, kept as the golden reference."""
+    text = html.escape(text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'<em>\1</em>', text)
+    text = re.sub(r'^### (.+)$', r'<h3 style="color:#2563eb;margin:16px 0 8px 0;">\1</h3>', text, flags=re.MULTILINE)
+    text = re.sub(r'^## (.+)$', r'<h2 style="color:#1d4ed8;margin:20px 0 10px 0;">\1</h2>', text, flags=re.MULTILINE)
+    text = re.sub(r'^# (.+)$', r'<h1 style="color:#1e40af;margin:24px 0 12px 0;">\1</h1>', text, flags=re.MULTILINE)
+    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" style="color:#2563eb;">\1</a>', text)
+    text = re.sub(
+        r'(?<!href=")(https?://[^\s<>"\)]+)',
+        r'<a href="\1" style="color:#2563eb;">\1</a>',
+        text
+    )
+    text = re.sub(r'^[\-\*] (.+)$', r'<li>\1</li>', text, flags=re.MULTILINE)
+    text = re.sub(r'((?:<li>.*?</li>\n?)+)', r'<ul style="margin:8px 0;padding-left:24px;">\1</ul>', text)
+    text = re.sub(r'^---+$', r'<hr style="border:none;border-top:1px solid #e5e7eb;margin:16px 0;">', text, flags=re.MULTILINE)
+    text = re.sub(r'\n(?!<)', r'<br>\n', text)
+    return text
+
+
+_WORDS = ["hello", "world", "a&b", "<tag>", '"q"', "it's", "x.y", "(paren)", "50%"]
+
+
+def _random_document(rng):
+    """
+    Markdown built from the constructs both renderers agree on: no numbered
+    lists (left unwrapped by the original), no "* " bullets (its italic pass ran
+    first), no rule straight after a list (its <ul> wrap swallowed the newline)
+    and no ***x*** (which it misnested).
+    """
+
+    def inline():
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 3)))
+        return rng.choice([
+            words,
+            f"**{words}**",
+            f"*{words}*",
+            f"[{words}](https://ex.com/{rng.randint(0, 9)})",
+            f"https://site.org/p?{rng.randint(0, 9)}=1",
+            f"**[{words}](https://b.c)**",
+            "see https://z.io.",
+        ])
+
+    def para():
+        return " ".join(inline() for _ in range(rng.randint(1, 4)))
+
+    def line():
+        return rng.choice([
+            lambda: "#" * rng.randint(1, 3) + " " + para(),
+            lambda: "---",
+            lambda: "- " + para(),
+            lambda: "",
+            para,
+            para,
+        ])()
+
+    lines = []
+    for _ in range(rng.randint(1, 12)):
+        out = line()
+        if out == "---" and lines and lines[-1].startswith("- "):
+            out = ""
+        lines.append(out)
+    return "\n".join(lines) + rng.choice(["", "\n"])
+
+
+@pytest.fixture
+def render():
+    return EmailChannelAdapter()._markdown_to_html
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("**bold**", "<strong>bold</strong>"),
+        ("*em*", "<em>em</em>"),
+        ("***both***", "<strong><em>both</em></strong>"),
+        ("a ***b*** **c** *d*", "a <strong><em>b</em></strong> <strong>c</strong> <em>d</em>"),
+        ("**[x](https://e.com)**", f'<strong><a href="https://e.com" {LINK}>x</a></strong>'),
+        ("[**x** y](https://e.com)", f'<a href="https://e.com" {LINK}><strong>x</strong> y</a>'),
+        ("see https://z.io.", f'see <a href="https://z.io." {LINK}>https://z.io.</a>'),
+        ("<b> & \"q\"", "&lt;b&gt; &amp; &quot;q&quot;"),
+    ],
+)
+def test_inline_markup(render, text, expected):
+    assert render(text) == expected
+
+
+def test_blocks_and_line_breaks(render):
+    text = "# Title\nintro *here*\n- one\n- **two**\n---\nend"
+    assert render(text).split("\n") == [
+        '<h1 style="color:#1e40af;margin:24px 0 12px 0;">Title</h1><br>',
+        "intro <em>here</em>",
+        '<ul style="margin:8px 0;padding-left:24px;"><li>one</li>',
+        "<li><strong>two</strong></li>",
+        '</ul><hr style="border:none;border-top:1px solid #e5e7eb;margin:16px 0;"><br>',
+        "end",
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference_renderer(render, seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        text = _random_document(rng)
+        assert render(text) == reference_markdown_to_html(text), text
@@ -0,0 +1,109 @@
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from plugins.matrix_channel.bot import MatrixChannelAdapter
+
+
+def reference_split(content, max_length=65535):
+    """The original re-slicing splitter, kept as the golden reference."""
+    if len(content) <= max_length:
+        return [content]
+    chunks = []
+    while content:
+        if len(content) <= max_length:
+            chunks.append(content)
+            break
+        split_at = content.rfind("\n", 0, max_length)
+        if split_at == -1:
+            split_at = content.rfind(" ", 0, max_length)
+        if split_at == -1:
+            split_at = max_length
+        chunks.append(content[:split_at])
+        content = content[split_at:].lstrip()
+    return chunks
+
+
+def _random_text(rng):
+    pieces = ["word", "x" * rng.randint(1, 40), " ", "  ", "\n", "\n\n", "\t", " \n "]
+    return "".join(rng.choice(pieces) for _ in range(rng.randint(0, 120)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_split_matches_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(400):
+        text = _random_text(rng)
+        max_length = rng.randint(1, 60)
+        assert MatrixChannelAdapter._split_message(text, max_length) == reference_split(text, max_length)
+
+
+@pytest.mark.parametrize(
+    ("text", "max_length"),
+    [("", 5), ("abc", 3), ("abcdef", 3), ("ab  \n\n  cd", 3), ("a\nb c\nd", 4), ("   ", 1), ("a   ", 2)],
+)
+def test_split_edge_cases_match_reference(text, max_length):
+    assert MatrixChannelAdapter._split_message(text, max_length) == reference_split(text, max_length)
+
+
+class FakeClient:
+    """room_send stand-in that raises an overload error on chosen calls."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self.delivered = []
+
+    async def room_send(self, room_id, message_type, content):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(0)  # let concurrent sends interleave
+        if call in self.fail_on:
+            raise RuntimeError("503 Service Unavailable")
+        self.delivered.append(content["body"])
+
+
+def _adapter(client, monkeypatch):
+    adapter = MatrixChannelAdapter()
+    adapter._client = client
+    monkeypatch.setattr(adapter, "BASE_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(adapter, "_split_message", lambda content, max_length: content.split("|"))
+    return adapter
+
+
+def test_ordered_retry_resumes_from_the_failed_chunk(monkeypatch):
+    client = FakeClient(fail_on={3})
+    adapter = _adapter(client, monkeypatch)
+
+    assert asyncio.run(adapter.send_message("room:!r:example.org", "a|b|c|d")) is True
+    assert client.delivered == ["a", "b", "c", "d"]
+
+
+def test_unordered_retry_resends_only_undelivered_chunks(monkeypatch):
+    client = FakeClient(fail_on={2, 4})
+    adapter = _adapter(client, monkeypatch)
+
+    sent = asyncio.run(adapter.send_message("room:!r:example.org", "a|b|c|d|e", ordered=False))
+    assert sent is True
+    assert sorted(client.delivered) == ["a", "b", "c", "d", "e"]
+    assert client.calls == 7
+
+
+def test_non_overload_error_is_not_retried(monkeypatch):
+    client = FakeClient()
+
+    async def room_send(room_id, message_type, content):
+        client.calls += 1
+        raise RuntimeError("forbidden")
+
+    client.room_send = room_send
+    adapter = _adapter(client, monkeypatch)
+    assert asyncio.run(adapter.send_message("room:!r:example.org", "a|b")) is False
+    assert client.calls == 1